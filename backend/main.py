@@ -15,8 +15,12 @@ if str(PROJECT_ROOT) not in sys.path:
 # Support running as a module (backend.main) and as a script (python main.py in backend/)
 try:
     from backend.routers import auth, analytics, clustering, listening_analytics, optimization, crud
+    from backend.services.reccobeats import close_shared_client
+    from backend.services.optimization import close_spotify_client
 except ModuleNotFoundError:
     from routers import auth, analytics, clustering, listening_analytics, optimization, crud
+    from services.reccobeats import close_shared_client
+    from services.optimization import close_spotify_client
 
 def _configure_logging():
     """Configure logging so our routers/services emit INFO-level logs in dev.
@@ -85,6 +89,14 @@ app.include_router(listening_analytics.router, prefix="/api", tags=["listening-a
 app.include_router(optimization.router, prefix="/api", tags=["playlist-optimization"])
 app.include_router(crud.router, prefix="/api", tags=["crud"])
 
+@app.on_event("shutdown")
+async def shutdown_http_clients():
+    """
+    Close pooled outbound HTTP clients.
+    """
+    await close_shared_client()
+    await close_spotify_client()
+
 @app.get("/")
 async def root():
     """
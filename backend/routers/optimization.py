@@ -2,6 +2,7 @@
 API endpoints for playlist optimization features.
 """
 from fastapi import APIRouter, Depends, HTTPException, status, Query
+from fastapi.responses import ORJSONResponse
 from sqlalchemy.orm import Session
 from typing import List, Dict, Any, Optional
 from backend.dependencies import get_database, get_current_user
@@ -11,7 +12,12 @@ import logging
 
 logger = logging.getLogger(__name__)
 
-router = APIRouter(prefix="/optimization", tags=["playlist-optimization"])
+# Recommendation payloads are large nested dicts; orjson serializes them much faster
+router = APIRouter(
+    prefix="/optimization",
+    tags=["playlist-optimization"],
+    default_response_class=ORJSONResponse
+)
 
 # Initialize optimization service
 optimization_service = PlaylistOptimizationService()
@@ -1,4 +1,6 @@
 from typing import List, Dict, Any
+import asyncio
+import operator
 import numpy as np
 import pandas as pd
 from sklearn.impute import KNNImputer
@@ -28,6 +30,13 @@ class AudioFeaturesService:
         "liveness": 0.2, "valence": 0.5, "tempo": 120.0
     }
 
+    # ReccoBeats batches of 40 respect its API limits; a few run concurrently
+    FETCH_BATCH_SIZE = 40
+    MAX_CONCURRENT_BATCHES = 8
+
+    # FEATURE_DEFAULTS aligned with AUDIO_FEATURES for vectorized fills
+    FEATURE_DEFAULTS_ARR = np.array(list(map(FEATURE_DEFAULTS.get, AUDIO_FEATURES)), dtype=np.float64)
+
     def __init__(self):
         """Initializes the service with its dependencies and ML models."""
         self.reccobeats_service = ReccoBeatsService()
@@ -57,12 +66,17 @@ class AudioFeaturesService:
             print("✅ All tracks have complete audio features.")
             return tracks
 
-        # Process tracks in batches of 40 to respect ReccoBeats API limits
-        batch_size = 40
-        for i in range(0, len(tracks_to_process), batch_size):
-            batch = tracks_to_process[i:i + batch_size]
-            await self._fetch_from_reccobeats(batch)
-            print(f"Processed batch {i//batch_size + 1}/{(len(tracks_to_process) + batch_size - 1)//batch_size}")
+        # Batches touch disjoint tracks, so they can be fetched concurrently
+        batch_size = self.FETCH_BATCH_SIZE
+        batches = [tracks_to_process[i:i + batch_size] for i in range(0, len(tracks_to_process), batch_size)]
+        semaphore = asyncio.Semaphore(self.MAX_CONCURRENT_BATCHES)
+
+        async def fetch_batch(number: int, batch: List[Track]):
+            async with semaphore:
+                await self._fetch_from_reccobeats(batch)
+            print(f"Processed batch {number}/{len(batches)}")
+
+        await asyncio.gather(*(fetch_batch(n, b) for n, b in enumerate(batches, 1)))
         
         self.impute_missing_features(tracks_to_process)
 
@@ -87,7 +101,7 @@ class AudioFeaturesService:
             return
 
         print(f"✅ Fetched {len(features_map)} feature sets from ReccoBeats.")
-        track_map = {(t.spotify_track_id or "").split(":")[-1]: t for t in tracks}
+        track_map = {(t.spotify_track_id or "").rpartition(":")[2]: t for t in tracks}
 
         updated_count = 0
         for spotify_id, features in features_map.items():
@@ -123,25 +137,25 @@ class AudioFeaturesService:
             self._fill_with_defaults(tracks)
             return
 
-        # Pre-impute columns with too few values for KNN to work reliably
-        for feature in self.AUDIO_FEATURES:
-            if features_df[feature].notna().sum() < 2:
-                fallback_val = self.FEATURE_DEFAULTS[feature]
-                features_df.loc[features_df[feature].isna(), feature] = fallback_val
+        # Pre-impute columns with too few values for KNN to work reliably,
+        # filling every such column from the aligned defaults array at once
+        values = features_df.to_numpy(dtype=np.float64)
+        missing = np.isnan(values)
+        sparse_columns = (~missing).sum(axis=0) < 2
+        values = np.where(missing & sparse_columns, self.FEATURE_DEFAULTS_ARR, values)
 
-        if features_df.isnull().values.any():
-            scaled_features = self.scaler.fit_transform(features_df)
+        if np.isnan(values).any():
+            scaled_features = self.scaler.fit_transform(values)
             imputed_scaled = self.imputer.fit_transform(scaled_features)
-            imputed_features = self.scaler.inverse_transform(imputed_scaled)
-            imputed_df = pd.DataFrame(imputed_features, columns=self.AUDIO_FEATURES, index=features_df.index)
+            imputed_values = self.scaler.inverse_transform(imputed_scaled)
         else:
-            imputed_df = features_df
+            imputed_values = values
 
-        # Update track objects safely to avoid SettingWithCopyWarning
-        for i, track in enumerate(tracks):
-            for feature in self.AUDIO_FEATURES:
-                setattr(track, feature, float(imputed_df.iloc[i][feature]))
-                track.features_imputed = True
+        # Update track objects from plain Python floats, one row per track
+        for track, row in zip(tracks, imputed_values.tolist()):
+            for feature, value in zip(self.AUDIO_FEATURES, row):
+                setattr(track, feature, value)
+            track.features_imputed = True
 
     def _fill_with_defaults(self, tracks: List[Track]):
         """Fills all missing audio features with default values."""
@@ -165,10 +179,14 @@ class AudioFeaturesService:
         total_tracks = len(tracks)
         if not total_tracks: return {"error": "No tracks provided"}
 
+        # Count missing (None) values for every feature in one vectorized pass
+        getter = operator.attrgetter(*self.AUDIO_FEATURES)
+        values = np.array([getter(t) for t in tracks], dtype=np.float64)
+        missing_counts = np.isnan(values).sum(axis=0).tolist()
+
         feature_quality = {}
         overall_missing = 0
-        for feature in self.AUDIO_FEATURES:
-            missing = sum(1 for t in tracks if getattr(t, feature) is None)
+        for feature, missing in zip(self.AUDIO_FEATURES, missing_counts):
             feature_quality[feature] = {
                 "present": total_tracks - missing,
                 "missing": missing,
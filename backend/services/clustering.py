@@ -13,6 +13,7 @@ from sklearn.decomposition import PCA
 from sklearn.metrics import silhouette_score, calinski_harabasz_score
 import statistics
 import logging
+import operator
 from sqlalchemy.orm import Session
 
 from backend.models import Track, PlaylistAnalysis
@@ -69,59 +70,56 @@ class ClusteringService:
         Raises:
             ValueError: If no valid features found
         """
-        features_data = []
-        raw_features_data = []  # Store raw features for labeling
+        if not tracks:
+            raise ValueError("No valid audio features found for clustering")
+        
         preprocessing_info = {
             "log_scaled_features": [],
             "feature_ranges": {},
             "outlier_count": 0
         }
         
-        for track in tracks:
-            track_features = []
-            raw_track_features = []  # Raw features before scaling
-            
-            for feature in self.AUDIO_FEATURES:
-                value = getattr(track, feature)
-                if value is not None:
-                    # Store raw value for labeling (0-1 scale for most features)
-                    if feature in ["tempo"]:
-                        # Normalize tempo to 0-1 scale for consistent labeling
-                        raw_value = min(max((value - 60) / (200 - 60), 0), 1)
-                    elif feature in ["loudness"]:
-                        # Normalize loudness to 0-1 scale
-                        raw_value = min(max((value + 60) / 60, 0), 1)
-                    else:
-                        # Most features are already 0-1 scale
-                        raw_value = min(max(value, 0), 1)
-                    raw_track_features.append(raw_value)
-                    
-                    # Apply log scaling for clustering features
-                    if feature in self.LOG_SCALE_FEATURES and value > 0:
-                        if feature == "tempo":
-                            # Tempo: log scale and normalize
-                            value = np.log(max(value, 1))  # Avoid log(0)
-                        elif feature == "loudness":
-                            # Loudness: shift to positive range then log scale
-                            value = np.log(max(value + 60, 1))  # Shift typical range [-60, 0] to [0, 60]
-                        if feature not in preprocessing_info["log_scaled_features"]:
-                            preprocessing_info["log_scaled_features"].append(feature)
-                    
-                    track_features.append(value)
-                else:
-                    # Fallback to defaults
-                    default_val = self.audio_features_service.FEATURE_DEFAULTS.get(feature, 0.5)
-                    track_features.append(default_val)
-                    raw_track_features.append(default_val)
-            
-            features_data.append(track_features)
-            raw_features_data.append(raw_track_features)
-        
-        if not features_data:
-            raise ValueError("No valid audio features found for clustering")
+        # Stack every track's features into one (n_tracks, n_features) array;
+        # missing (None) values become NaN so they can be masked in bulk
+        getter = operator.attrgetter(*self.AUDIO_FEATURES)
+        values = np.array([getter(track) for track in tracks], dtype=np.float64)
+        values = values.reshape(len(tracks), len(self.AUDIO_FEATURES))
+        missing = np.isnan(values)
+        defaults = np.array(
+            [self.audio_features_service.FEATURE_DEFAULTS.get(f, 0.5) for f in self.AUDIO_FEATURES],
+            dtype=np.float64
+        )
         
-        features_array = np.array(features_data)
-        raw_features_array = np.array(raw_features_data)
+        # Raw features for labeling on a 0-1 scale: tempo and loudness are
+        # normalized from their typical ranges, the rest are already 0-1
+        raw_features_array = np.clip(values, 0, 1)
+        tempo_idx = self.AUDIO_FEATURES.index("tempo")
+        loudness_idx = self.AUDIO_FEATURES.index("loudness")
+        raw_features_array[:, tempo_idx] = np.clip((values[:, tempo_idx] - 60) / (200 - 60), 0, 1)
+        raw_features_array[:, loudness_idx] = np.clip((values[:, loudness_idx] + 60) / 60, 0, 1)
+        
+        # Apply log scaling for clustering features (positive values only)
+        features_array = values.copy()
+        first_scaled = []
+        for feature in self.LOG_SCALE_FEATURES:
+            idx = self.AUDIO_FEATURES.index(feature)
+            column = values[:, idx]
+            scale_mask = ~missing[:, idx] & (column > 0)
+            if not scale_mask.any():
+                continue
+            if feature == "tempo":
+                # Tempo: log scale and normalize
+                features_array[scale_mask, idx] = np.log(np.maximum(column[scale_mask], 1))  # Avoid log(0)
+            elif feature == "loudness":
+                # Loudness: shift to positive range then log scale
+                features_array[scale_mask, idx] = np.log(np.maximum(column[scale_mask] + 60, 1))  # Shift typical range [-60, 0] to [0, 60]
+            first_scaled.append((int(np.argmax(scale_mask)), idx, feature))
+        # Report log-scaled features in the order they were first encountered
+        preprocessing_info["log_scaled_features"] = [feature for _, _, feature in sorted(first_scaled)]
+        
+        # Fallback to defaults for missing values
+        features_array = np.where(missing, defaults, features_array)
+        raw_features_array = np.where(missing, defaults, raw_features_array)
         
         # Store feature ranges for interpretation
         for i, feature in enumerate(self.AUDIO_FEATURES):
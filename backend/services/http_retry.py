@@ -0,0 +1,85 @@
+"""
+Retry loop shared by the outbound HTTP calls to Spotify and ReccoBeats.
+"""
+from typing import Any, AsyncContextManager, Collection, Optional
+import asyncio
+import logging
+import random
+import httpx
+
+__all__ = ["MAX_RETRY_AFTER", "get_with_retry"]
+
+logger = logging.getLogger(__name__)
+
+# Longest Retry-After (seconds) worth waiting for; a server asking for more
+# gets its response handed back to the caller instead of stalling the request
+MAX_RETRY_AFTER = 10.0
+
+
+def _retry_after_seconds(response: httpx.Response) -> Optional[float]:
+    """Parse a numeric Retry-After header, or None if absent or not a number."""
+    try:
+        return float(response.headers["Retry-After"])
+    except (KeyError, ValueError):
+        return None
+
+
+async def get_with_retry(
+    client: httpx.AsyncClient,
+    url: str,
+    *,
+    max_retries: int,
+    retryable_status_codes: Collection[int],
+    backoff_base: float,
+    backoff_max: float,
+    max_retry_after: float = MAX_RETRY_AFTER,
+    limiter: Optional[AsyncContextManager[Any]] = None,
+    **kwargs
+) -> httpx.Response:
+    """
+    GET a URL, retrying transport errors and retryable status codes.
+
+    Retries use jittered exponential backoff. A Retry-After header on a 429
+    response takes precedence over the backoff as long as it is at most
+    max_retry_after seconds; a longer one fails fast by returning the 429.
+
+    Args:
+        client: Client to send the request with
+        url: Endpoint URL
+        max_retries: Retries after the first attempt
+        retryable_status_codes: Status codes that trigger a retry
+        backoff_base: Backoff before the first retry, in seconds
+        backoff_max: Upper bound on the backoff, in seconds
+        max_retry_after: Longest Retry-After to honour, in seconds
+        limiter: Optional async context manager (e.g. a semaphore or rate
+            limiter) entered around each request
+        **kwargs: Passed through to httpx.AsyncClient.get
+
+    Returns:
+        httpx.Response: The final response
+    """
+    for attempt in range(max_retries + 1):
+        try:
+            if limiter is None:
+                response = await client.get(url, **kwargs)
+            else:
+                async with limiter:
+                    response = await client.get(url, **kwargs)
+        except httpx.TransportError as e:
+            if attempt == max_retries:
+                raise
+            logger.warning("Request to %s failed (%s), retrying", url, e)
+            delay = None
+        else:
+            if response.status_code not in retryable_status_codes or attempt == max_retries:
+                return response
+            delay = _retry_after_seconds(response) if response.status_code == 429 else None
+            if delay is not None and delay > max_retry_after:
+                logger.warning("%s asked to retry after %.0fs, giving up", url, delay)
+                return response
+            logger.warning("%s returned %s, retrying", url, response.status_code)
+
+        if delay is None:
+            backoff = min(backoff_max, backoff_base * 2 ** attempt)
+            delay = random.uniform(backoff / 2, backoff)
+        await asyncio.sleep(delay)
@@ -2,26 +2,107 @@
 Core playlist optimization engine.
 Provides actionable recommendations for improving playlist quality and flow.
 """
-from typing import List, Dict, Any, Optional, Tuple
+from typing import List, Dict, Any, Optional, Tuple, AsyncIterator
 from datetime import datetime
-import statistics
+from collections import Counter
+import copy
 import logging
+import asyncio
+import time
 from sqlalchemy.orm import Session
 from backend.models import User, Playlist, Track
 from backend.services.listening_analytics import ListeningAnalyticsService
 from backend.services.clustering import ClusteringService
+from backend.services.http_retry import get_with_retry
 import httpx
 import random
+import numpy as np
 
 logger = logging.getLogger(__name__)
 
+# One pooled Spotify Web API client shared by every PlaylistOptimizationService
+# instance so keep-alive connections are reused across lookups. Like the
+# ReccoBeats client it is bound to the event loop that created it.
+_spotify_client: Optional[httpx.AsyncClient] = None
+_spotify_client_loop: Optional[asyncio.AbstractEventLoop] = None
+
+def _get_spotify_client() -> httpx.AsyncClient:
+    """Get the shared Spotify client, creating it on first use or for a new loop."""
+    global _spotify_client, _spotify_client_loop
+    loop = asyncio.get_running_loop()
+    if _spotify_client is None or _spotify_client.is_closed or _spotify_client_loop is not loop:
+        _spotify_client = httpx.AsyncClient(http2=True)
+        _spotify_client_loop = loop
+    return _spotify_client
+
+async def close_spotify_client() -> None:
+    """Close the shared Spotify HTTP client, if one has been created."""
+    global _spotify_client, _spotify_client_loop
+    if _spotify_client is not None and not _spotify_client.is_closed:
+        await _spotify_client.aclose()
+    _spotify_client = None
+    _spotify_client_loop = None
+
+# Sort rank for recommendation priorities (lower sorts first)
+_PRIORITY_SCORE = {"high": 1, "medium": 2, "low": 3}
+
+def _recommendation_rank(rec: Dict[str, Any]) -> Tuple[int, float]:
+    """Sort key ordering recommendations by priority, then by descending impact."""
+    return (_PRIORITY_SCORE.get(rec["priority"], 4), -rec.get("impact_score", 0))
+
+def _potential_kernel(skip_rate: float, quality_score: float, problematic_ratio: float) -> float:
+    """Combine playlist health indicators into a 0-1 optimization potential."""
+    # Higher skip rate = more potential
+    skip_potential = min(skip_rate * 2, 1.0)
+    
+    # Lower quality = more potential
+    quality_potential = max(0, 1 - quality_score)
+    
+    # More problematic tracks = more potential
+    problematic_potential = min(problematic_ratio * 2, 1.0)
+    
+    # Average the potentials
+    overall_potential = (skip_potential + quality_potential + problematic_potential) / 3
+    
+    return min(overall_potential, 1.0)
+
 class PlaylistOptimizationService:
     """Service for generating actionable playlist optimization recommendations."""
     
+    # Column layout of the per-playlist audio feature matrix
+    MATRIX_FEATURES = (
+        "danceability", "energy", "valence", "acousticness", "instrumentalness",
+        "speechiness", "liveness", "tempo", "loudness"
+    )
+    FEATURE_INDEX = {feature: i for i, feature in enumerate(MATRIX_FEATURES)}
+    
+    # Values used when a track has no audio features for a column
+    FEATURE_DEFAULTS = {
+        "danceability": 0.5, "energy": 0.5, "valence": 0.5, "acousticness": 0.5,
+        "instrumentalness": 0.5, "speechiness": 0.5, "liveness": 0.5,
+        "tempo": 120.0, "loudness": -10.0
+    }
+    MATRIX_DEFAULTS = np.array(list(map(FEATURE_DEFAULTS.get, MATRIX_FEATURES)), dtype=np.float64)
+    
+    # Optimization results are cached per playlist snapshot for this long (seconds).
+    # The cache lives in each worker process, and the key does not track stored
+    # audio features, so DB-side feature updates (e.g. from
+    # scripts/update_audio_features.py) show up only once the entry expires.
+    RESULT_CACHE_TTL = 3600
+    RESULT_CACHE_MAX_ENTRIES = 256
+    
+    # Outbound Spotify request limits
+    MAX_CONCURRENT_SPOTIFY_REQUESTS = 10
+    MAX_RATE_LIMIT_RETRIES = 3
+    RATE_LIMIT_BACKOFF = 1.0  # seconds, when a 429 carries no Retry-After
+    
     def __init__(self):
         self.logger = logger
         self.analytics_service = ListeningAnalyticsService()
         # Note: clustering_service will be initialized when needed with proper dependencies
+        # (user_id, playlist_id, snapshot_id, sorted unique goals) -> (expires_at, result)
+        self._result_cache: Dict[Tuple[str, str, str, Tuple[str, ...]], Tuple[float, Dict[str, Any]]] = {}
+        self._rate_limiter = asyncio.Semaphore(self.MAX_CONCURRENT_SPOTIFY_REQUESTS)
     
     async def optimize_playlist(
         self,
@@ -49,40 +130,48 @@ class PlaylistOptimizationService:
             if optimization_goals is None:
                 optimization_goals = ['flow', 'quality', 'discovery']
             
+            # Spotify changes the snapshot ID on every playlist edit, so a cached
+            # result for the current snapshot is still valid
+            snapshot_id = await self._get_playlist_snapshot_id(playlist_id, access_token)
+            cache_key = None
+            if snapshot_id:
+                # Goal order and repeats do not change the recommendations, so the
+                # key holds the normalized goal set
+                cache_key = (user_id, playlist_id, snapshot_id, tuple(sorted(set(optimization_goals))))
+                cached = self._get_cached_result(cache_key)
+                if cached is not None:
+                    # Echo this caller's goals and stamp the time of this request
+                    cached["optimization_goals"] = optimization_goals
+                    cached["optimization_timestamp"] = datetime.utcnow().isoformat()
+                    return cached
+            
             # Get comprehensive playlist data
             playlist_data = await self._gather_playlist_data(
-                user_id, playlist_id, db, access_token
+                user_id, playlist_id, db, access_token, optimization_goals
             )
             
-            # Generate optimization recommendations
-            recommendations = []
-            
-            if 'flow' in optimization_goals:
-                flow_recs = await self._optimize_flow(playlist_data, access_token)
-                recommendations.extend(flow_recs)
-            
-            if 'quality' in optimization_goals:
-                quality_recs = await self._optimize_quality(playlist_data, access_token)
-                recommendations.extend(quality_recs)
-            
-            if 'discovery' in optimization_goals:
-                discovery_recs = await self._optimize_discovery(playlist_data, access_token)
-                recommendations.extend(discovery_recs)
-            
-            if 'energy' in optimization_goals:
-                energy_recs = await self._optimize_energy_balance(playlist_data)
-                recommendations.extend(energy_recs)
+            # Generate optimization recommendations; each optimizer streams its
+            # recommendations so no intermediate per-goal lists are built
+            optimizers = {
+                'flow': lambda: self._optimize_flow(playlist_data, access_token),
+                'quality': lambda: self._optimize_quality(playlist_data, access_token),
+                'discovery': lambda: self._optimize_discovery(playlist_data, access_token),
+                'energy': lambda: self._optimize_energy_balance(playlist_data),
+            }
+            recommendations = [
+                rec
+                for goal in optimizers
+                if goal in optimization_goals
+                async for rec in optimizers[goal]()
+            ]
             
             # Sort recommendations by priority and impact
-            recommendations.sort(key=lambda x: (
-                self._priority_score(x['priority']),
-                -x.get('impact_score', 0)
-            ))
+            recommendations.sort(key=_recommendation_rank)
             
             # Calculate optimization summary
             summary = self._generate_optimization_summary(recommendations, playlist_data)
             
-            return {
+            result = {
                 "playlist_id": playlist_id,
                 "optimization_goals": optimization_goals,
                 "recommendations": recommendations,
@@ -91,41 +180,127 @@ class PlaylistOptimizationService:
                 "optimization_timestamp": datetime.utcnow().isoformat()
             }
             
+            if cache_key is not None:
+                self._cache_result(cache_key, result)
+            
+            return result
+            
         except Exception as e:
             self.logger.error(f"Error optimizing playlist: {str(e)}")
             raise
     
+    async def _spotify_get(self, client: httpx.AsyncClient, url: str, **kwargs) -> httpx.Response:
+        """
+        GET a Spotify endpoint under the service-wide concurrency limit.
+        
+        Rate-limited (429) responses are retried after the Retry-After delay
+        Spotify asks for, up to MAX_RATE_LIMIT_RETRIES times; a Retry-After
+        longer than http_retry.MAX_RETRY_AFTER returns the 429 immediately.
+        """
+        return await get_with_retry(
+            client,
+            url,
+            max_retries=self.MAX_RATE_LIMIT_RETRIES,
+            retryable_status_codes=(429,),
+            backoff_base=self.RATE_LIMIT_BACKOFF,
+            backoff_max=self.RATE_LIMIT_BACKOFF,
+            limiter=self._rate_limiter,
+            **kwargs
+        )
+    
+    async def _get_playlist_snapshot_id(self, playlist_id: str, access_token: str) -> Optional[str]:
+        """Fetch the playlist's current snapshot ID, or None if it is unavailable."""
+        try:
+            response = await self._spotify_get(
+                _get_spotify_client(),
+                f"https://api.spotify.com/v1/playlists/{playlist_id}",
+                headers={"Authorization": f"Bearer {access_token}"},
+                params={"fields": "snapshot_id"}
+            )
+            
+            if response.status_code != 200:
+                return None
+            
+            return response.json().get("snapshot_id")
+            
+        except Exception as e:
+            self.logger.warning(f"Error fetching playlist snapshot: {str(e)}")
+            return None
+    
+    def _get_cached_result(self, cache_key: Tuple) -> Optional[Dict[str, Any]]:
+        """
+        Return a copy of a cached optimization result if it has not expired.
+        
+        Each hit gets its own deep copy, so callers may modify the result
+        without affecting later hits.
+        """
+        entry = self._result_cache.get(cache_key)
+        if entry is None:
+            return None
+        
+        expires_at, result = entry
+        if expires_at <= time.monotonic():
+            del self._result_cache[cache_key]
+            return None
+        
+        return copy.deepcopy(result)
+    
+    def _cache_result(self, cache_key: Tuple, result: Dict[str, Any]) -> None:
+        """Store a copy of an optimization result, evicting the oldest entries when full."""
+        self._result_cache.pop(cache_key, None)
+        while len(self._result_cache) >= self.RESULT_CACHE_MAX_ENTRIES:
+            del self._result_cache[next(iter(self._result_cache))]
+        
+        self._result_cache[cache_key] = (time.monotonic() + self.RESULT_CACHE_TTL, copy.deepcopy(result))
+    
     async def _gather_playlist_data(
         self,
         user_id: str,
         playlist_id: str,
         db: Session,
-        access_token: str
+        access_token: str,
+        optimization_goals: List[str]
     ) -> Dict[str, Any]:
-        """Gather comprehensive data about the playlist for optimization."""
-        # Get listening analytics
-        track_performance = await self.analytics_service.analyze_track_performance(
-            user_id, playlist_id, db, access_token
-        )
+        """
+        Gather the playlist data needed for the requested optimization goals.
+        
+        Listening analytics and tracks are always loaded since the playlist
+        metrics depend on them; overskipped tracks, hidden gems and clustering
+        are only fetched for the goals that consume them.
+        """
+        fetches = {
+            # Get listening analytics
+            "track_performance": self.analytics_service.analyze_track_performance(
+                user_id, playlist_id, db, access_token
+            ),
+            # Get playlist tracks with audio features
+            "tracks": self._get_playlist_tracks_with_features(
+                playlist_id, access_token
+            )
+        }
         
         # Get overskipped tracks
-        overskipped = await self.analytics_service.identify_overskipped_tracks(
-            user_id, playlist_id, db, access_token
-        )
+        if 'quality' in optimization_goals:
+            fetches["overskipped"] = self.analytics_service.identify_overskipped_tracks(
+                user_id, playlist_id, db, access_token
+            )
         
         # Get hidden gems
-        hidden_gems = await self.analytics_service.find_hidden_gems(
-            user_id, playlist_id, db, access_token
-        )
+        if 'discovery' in optimization_goals:
+            fetches["hidden_gems"] = self.analytics_service.find_hidden_gems(
+                user_id, playlist_id, db, access_token
+            )
         
-        # Get playlist tracks with audio features
-        playlist_tracks = await self._get_playlist_tracks_with_features(
-            playlist_id, access_token
-        )
+        results = dict(zip(fetches.keys(), await asyncio.gather(*fetches.values())))
+        track_performance = results["track_performance"]
+        playlist_tracks = results["tracks"]
+        overskipped = results.get("overskipped", [])
+        hidden_gems = results.get("hidden_gems", [])
         
         # Get clustering analysis (simplified for now)
         clustering_data = None
-        if len(playlist_tracks.get('tracks_list', [])) >= 3:  # Need minimum tracks for clustering
+        needs_clustering = 'discovery' in optimization_goals
+        if needs_clustering and len(playlist_tracks.get('tracks_list', [])) >= 3:  # Need minimum tracks for clustering
             try:
                 # For now, create a basic mock clustering structure
                 # TODO: Implement proper clustering when dependencies are available
@@ -150,20 +325,21 @@ class PlaylistOptimizationService:
         self,
         playlist_data: Dict[str, Any],
         access_token: str
-    ) -> List[Dict[str, Any]]:
+    ) -> AsyncIterator[Dict[str, Any]]:
         """Generate recommendations for improving playlist flow."""
-        recommendations = []
-        
-        tracks = playlist_data.get("tracks", {}).get("tracks_list", [])
+        tracks_data = playlist_data.get("tracks", {})
+        tracks = tracks_data.get("tracks_list", [])
         if len(tracks) < 2:
-            return recommendations
+            return
+        
+        features_arr = tracks_data["features_arr"]
         
         # Analyze energy transitions
-        energy_issues = self._analyze_energy_transitions(tracks)
+        energy_issues = self._analyze_energy_transitions(tracks, features_arr)
         
         for issue in energy_issues:
             if issue['type'] == 'abrupt_energy_drop':
-                recommendations.append({
+                yield {
                     "type": "reorder_tracks",
                     "priority": "high",
                     "title": "Fix Abrupt Energy Drop",
@@ -176,10 +352,10 @@ class PlaylistOptimizationService:
                     },
                     "impact_score": 0.8,
                     "confidence": 0.7
-                })
+                }
             
             elif issue['type'] == 'energy_spike':
-                recommendations.append({
+                yield {
                     "type": "reorder_tracks",
                     "priority": "medium",
                     "title": "Smooth Energy Spike",
@@ -192,13 +368,13 @@ class PlaylistOptimizationService:
                     },
                     "impact_score": 0.6,
                     "confidence": 0.6
-                })
+                }
         
         # Analyze tempo consistency
-        tempo_issues = self._analyze_tempo_flow(tracks)
+        tempo_issues = self._analyze_tempo_flow(tracks, features_arr)
         
         for issue in tempo_issues:
-            recommendations.append({
+            yield {
                 "type": "reorder_tracks",
                 "priority": "medium",
                 "title": "Improve Tempo Flow",
@@ -210,24 +386,26 @@ class PlaylistOptimizationService:
                 },
                 "impact_score": 0.5,
                 "confidence": 0.5
-            })
-        
-        return recommendations
+            }
     
     async def _optimize_quality(
         self,
         playlist_data: Dict[str, Any],
         access_token: str
-    ) -> List[Dict[str, Any]]:
+    ) -> AsyncIterator[Dict[str, Any]]:
         """Generate recommendations for improving track quality."""
-        recommendations = []
-        
-        overskipped = playlist_data.get("overskipped", [])
+        # Worst offenders first, so the replacement slice really is the top 3
+        overskipped = sorted(
+            playlist_data.get("overskipped", []),
+            key=lambda t: t['skip_rate'],
+            reverse=True
+        )
         
-        # Remove highly skipped tracks
-        for track in overskipped:
+        replacement_candidates = []
+        for rank, track in enumerate(overskipped):
+            # Remove highly skipped tracks
             if track['skip_rate'] > 0.5 and track['confidence'] > 0.6:
-                recommendations.append({
+                yield {
                     "type": "remove_track",
                     "priority": "high",
                     "title": "Remove Frequently Skipped Track",
@@ -242,46 +420,46 @@ class PlaylistOptimizationService:
                     },
                     "impact_score": 0.9,
                     "confidence": track['confidence']
-                })
-        
-        # Suggest replacements for removed tracks
-        for track in overskipped[:3]:  # Top 3 problematic tracks
-            if track['skip_rate'] > 0.4:
-                replacement_suggestions = await self._find_track_replacements(
-                    track, playlist_data, access_token
-                )
-                
-                if replacement_suggestions:
-                    recommendations.append({
-                        "type": "replace_track",
-                        "priority": "medium",
-                        "title": "Replace with Better Alternative",
-                        "description": f"Found better alternatives for '{track['track_name']}'",
-                        "action": "replace",
-                        "details": {
-                            "remove_track_id": track['track_id'],
-                            "suggestions": replacement_suggestions[:3],  # Top 3 suggestions
-                            "reason": "Higher quality alternatives available"
-                        },
-                        "impact_score": 0.7,
-                        "confidence": 0.6
-                    })
-        
-        return recommendations
+                }
+            
+            # Suggest replacements for the top 3 problematic tracks
+            if rank < 3 and track['skip_rate'] > 0.4:
+                replacement_candidates.append(track)
+        
+        # Look up all replacements concurrently
+        replacement_results = await asyncio.gather(*(
+            self._find_track_replacements(track, playlist_data, access_token)
+            for track in replacement_candidates
+        ))
+        
+        for track, replacement_suggestions in zip(replacement_candidates, replacement_results):
+            if replacement_suggestions:
+                yield {
+                    "type": "replace_track",
+                    "priority": "medium",
+                    "title": "Replace with Better Alternative",
+                    "description": f"Found better alternatives for '{track['track_name']}'",
+                    "action": "replace",
+                    "details": {
+                        "remove_track_id": track['track_id'],
+                        "suggestions": replacement_suggestions[:3],  # Top 3 suggestions
+                        "reason": "Higher quality alternatives available"
+                    },
+                    "impact_score": 0.7,
+                    "confidence": 0.6
+                }
     
     async def _optimize_discovery(
         self,
         playlist_data: Dict[str, Any],
         access_token: str
-    ) -> List[Dict[str, Any]]:
+    ) -> AsyncIterator[Dict[str, Any]]:
         """Generate recommendations for better music discovery."""
-        recommendations = []
-        
         hidden_gems = playlist_data.get("hidden_gems", [])
         
         # Promote hidden gems
         for gem in hidden_gems[:3]:  # Top 3 hidden gems
-            recommendations.append({
+            yield {
                 "type": "promote_track",
                 "priority": "medium",
                 "title": "Promote Hidden Gem",
@@ -297,7 +475,7 @@ class PlaylistOptimizationService:
                 },
                 "impact_score": 0.6,
                 "confidence": 0.7
-            })
+            }
         
         # Suggest new tracks based on clustering
         clustering_data = playlist_data.get("clustering")
@@ -307,7 +485,7 @@ class PlaylistOptimizationService:
             )
             
             for suggestion in cluster_suggestions[:2]:  # Top 2 cluster suggestions
-                recommendations.append({
+                yield {
                     "type": "add_track",
                     "priority": "low",
                     "title": f"Add Track to {suggestion['cluster_name']} Cluster",
@@ -320,32 +498,29 @@ class PlaylistOptimizationService:
                     },
                     "impact_score": 0.4,
                     "confidence": 0.5
-                })
-        
-        return recommendations
+                }
     
     async def _optimize_energy_balance(
         self,
         playlist_data: Dict[str, Any]
-    ) -> List[Dict[str, Any]]:
+    ) -> AsyncIterator[Dict[str, Any]]:
         """Generate recommendations for better energy balance."""
-        recommendations = []
-        
-        tracks = playlist_data.get("tracks", {}).get("tracks_list", [])
+        tracks_data = playlist_data.get("tracks", {})
+        tracks = tracks_data.get("tracks_list", [])
         if len(tracks) < 5:
-            return recommendations
+            return
         
         # Calculate energy distribution
-        energies = [track.get("audio_features", {}).get("energy", 0.5) for track in tracks]
-        avg_energy = statistics.mean(energies)
-        energy_std = statistics.stdev(energies) if len(energies) > 1 else 0
+        energies = tracks_data["features_arr"][:, self.FEATURE_INDEX["energy"]]
+        avg_energy = float(energies.mean())
+        energy_std = float(energies.std(ddof=1)) if energies.size > 1 else 0
         
         # Check for energy imbalance
-        high_energy_count = sum(1 for e in energies if e > 0.7)
-        low_energy_count = sum(1 for e in energies if e < 0.3)
+        high_energy_count = int(np.count_nonzero(energies > 0.7))
+        low_energy_count = int(np.count_nonzero(energies < 0.3))
         
         if high_energy_count / len(tracks) > 0.7:
-            recommendations.append({
+            yield {
                 "type": "balance_energy",
                 "priority": "medium",
                 "title": "Too Much High Energy",
@@ -358,10 +533,10 @@ class PlaylistOptimizationService:
                 },
                 "impact_score": 0.6,
                 "confidence": 0.7
-            })
+            }
         
         elif low_energy_count / len(tracks) > 0.7:
-            recommendations.append({
+            yield {
                 "type": "balance_energy",
                 "priority": "medium",
                 "title": "Too Much Low Energy",
@@ -374,9 +549,7 @@ class PlaylistOptimizationService:
                 },
                 "impact_score": 0.6,
                 "confidence": 0.7
-            })
-        
-        return recommendations
+            }
     
     async def _get_playlist_tracks_with_features(
         self,
@@ -387,138 +560,141 @@ class PlaylistOptimizationService:
         try:
             headers = {"Authorization": f"Bearer {access_token}"}
             
-            # Get playlist tracks
-            async with httpx.AsyncClient() as client:
-                tracks_response = await client.get(
-                    f"https://api.spotify.com/v1/playlists/{playlist_id}/tracks",
-                    headers=headers,
-                    params={"limit": 100}
-                )
-                
-                if tracks_response.status_code != 200:
-                    return {"tracks_list": [], "features_df": None}
-                
-                tracks_data = tracks_response.json()
-                tracks = tracks_data.get("items", [])
-                
-                # Get audio features for all tracks
-                track_ids = [item["track"]["id"] for item in tracks if item["track"]["id"]]
-                
-                if not track_ids:
-                    return {"tracks_list": [], "features_df": None}
-                
-                features_response = await client.get(
-                    "https://api.spotify.com/v1/audio-features",
-                    headers=headers,
-                    params={"ids": ",".join(track_ids)}
-                )
-                
-                features_data = features_response.json() if features_response.status_code == 200 else {"audio_features": []}
-                audio_features = features_data.get("audio_features", [])
-                
-                # Combine track info with audio features
-                tracks_with_features = []
-                features_list = []
-                
-                for i, item in enumerate(tracks):
-                    track = item["track"]
-                    features = audio_features[i] if i < len(audio_features) and audio_features[i] else {}
-                    
-                    track_data = {
-                        "id": track["id"],
-                        "name": track["name"],
-                        "artist": track["artists"][0]["name"] if track["artists"] else "Unknown",
-                        "audio_features": features
-                    }
-                    
-                    tracks_with_features.append(track_data)
-                    
-                    if features:
-                        features_list.append({
-                            "danceability": features.get("danceability", 0.5),
-                            "energy": features.get("energy", 0.5),
-                            "valence": features.get("valence", 0.5),
-                            "acousticness": features.get("acousticness", 0.5),
-                            "instrumentalness": features.get("instrumentalness", 0.5),
-                            "speechiness": features.get("speechiness", 0.5),
-                            "liveness": features.get("liveness", 0.5),
-                            "tempo": features.get("tempo", 120),
-                            "loudness": features.get("loudness", -10)
-                        })
-                
-                # Create DataFrame for clustering
-                import pandas as pd
-                features_df = pd.DataFrame(features_list) if features_list else None
+            # Get playlist tracks on the shared client
+            client = _get_spotify_client()
+            tracks_response = await self._spotify_get(
+                client,
+                f"https://api.spotify.com/v1/playlists/{playlist_id}/tracks",
+                headers=headers,
+                params={"limit": 100}
+            )
+            
+            if tracks_response.status_code != 200:
+                return self._empty_tracks_data()
+            
+            tracks_data = tracks_response.json()
+            tracks = tracks_data.get("items", [])
+            
+            # Get audio features for all tracks
+            track_ids = [item["track"]["id"] for item in tracks if item["track"]["id"]]
+            
+            if not track_ids:
+                return self._empty_tracks_data()
+            
+            features_response = await self._spotify_get(
+                client,
+                "https://api.spotify.com/v1/audio-features",
+                headers=headers,
+                params={"ids": ",".join(track_ids)}
+            )
+            
+            features_data = features_response.json() if features_response.status_code == 200 else {"audio_features": []}
+            audio_features = features_data.get("audio_features", [])
+            
+            # Combine track info with audio features
+            tracks_with_features = []
+            feature_rows = []
+            
+            for i, item in enumerate(tracks):
+                track = item["track"]
+                features = audio_features[i] if i < len(audio_features) and audio_features[i] else {}
                 
-                return {
-                    "tracks_list": tracks_with_features,
-                    "features_df": features_df
+                track_data = {
+                    "id": track["id"],
+                    "name": track["name"],
+                    "artist": track["artists"][0]["name"] if track["artists"] else "Unknown",
+                    "audio_features": features
                 }
                 
+                tracks_with_features.append(track_data)
+                feature_rows.append([
+                    features.get(feature, np.nan)
+                    for feature in self.MATRIX_FEATURES
+                ])
+            
+            return {
+                "tracks_list": tracks_with_features,
+                "features_arr": self._build_feature_matrix(feature_rows),
+                "feature_index": self.FEATURE_INDEX
+            }
+            
         except Exception as e:
             self.logger.error(f"Error getting playlist tracks with features: {str(e)}")
-            return {"tracks_list": [], "features_df": None}
+            return self._empty_tracks_data()
+    
+    def _empty_tracks_data(self) -> Dict[str, Any]:
+        """Tracks payload used when the playlist could not be loaded."""
+        return {
+            "tracks_list": [],
+            "features_arr": self._build_feature_matrix([]),
+            "feature_index": self.FEATURE_INDEX
+        }
+    
+    def _build_feature_matrix(self, feature_rows: List[List[float]]) -> np.ndarray:
+        """
+        Stack per-track feature rows into a contiguous (n_tracks, n_features) matrix.
+        
+        Missing values (absent keys or None) arrive as NaN and are imputed here,
+        column by column, with FEATURE_DEFAULTS so downstream code can read the
+        matrix without defensive defaults.
+        """
+        features_arr = np.array(feature_rows, dtype=np.float64).reshape(-1, len(self.MATRIX_FEATURES))
+        return np.ascontiguousarray(
+            np.where(np.isnan(features_arr), self.MATRIX_DEFAULTS, features_arr)
+        )
     
-    def _analyze_energy_transitions(self, tracks: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    def _analyze_energy_transitions(
+        self,
+        tracks: List[Dict[str, Any]],
+        features_arr: np.ndarray
+    ) -> List[Dict[str, Any]]:
         """Analyze energy transitions between consecutive tracks."""
         issues = []
         
-        for i in range(len(tracks) - 1):
+        energies = features_arr[:, self.FEATURE_INDEX["energy"]]
+        energy_diffs = np.diff(energies)
+        
+        # Detect abrupt energy drops and energy spikes; only the flagged
+        # transitions are visited in Python
+        flagged = np.flatnonzero((energy_diffs < -0.4) | (energy_diffs > 0.5))
+        
+        for i in flagged:
             track1 = tracks[i]
             track2 = tracks[i + 1]
-            
-            energy1 = track1.get("audio_features", {}).get("energy", 0.5)
-            energy2 = track2.get("audio_features", {}).get("energy", 0.5)
-            
-            energy_diff = energy2 - energy1
-            
-            # Detect abrupt energy drops
-            if energy_diff < -0.4:
-                issues.append({
-                    "type": "abrupt_energy_drop",
-                    "track1_id": track1["id"],
-                    "track1_name": track1["name"],
-                    "track2_id": track2["id"],
-                    "track2_name": track2["name"],
-                    "energy_diff": energy_diff
-                })
-            
-            # Detect energy spikes
-            elif energy_diff > 0.5:
-                issues.append({
-                    "type": "energy_spike",
-                    "track1_id": track1["id"],
-                    "track1_name": track1["name"],
-                    "track2_id": track2["id"],
-                    "track2_name": track2["name"],
-                    "energy_diff": energy_diff
-                })
+            energy_diff = float(energy_diffs[i])
+            issues.append({
+                "type": "abrupt_energy_drop" if energy_diff < 0 else "energy_spike",
+                "track1_id": track1["id"],
+                "track1_name": track1["name"],
+                "track2_id": track2["id"],
+                "track2_name": track2["name"],
+                "energy_diff": energy_diff
+            })
         
         return issues
     
-    def _analyze_tempo_flow(self, tracks: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    def _analyze_tempo_flow(
+        self,
+        tracks: List[Dict[str, Any]],
+        features_arr: np.ndarray
+    ) -> List[Dict[str, Any]]:
         """Analyze tempo flow issues."""
         issues = []
         
-        for i in range(len(tracks) - 1):
-            track1 = tracks[i]
+        tempos = features_arr[:, self.FEATURE_INDEX["tempo"]]
+        tempo_diffs = np.abs(np.diff(tempos))
+        
+        # Detect large tempo jumps (more than 40 BPM difference)
+        for i in np.flatnonzero(tempo_diffs > 40):
             track2 = tracks[i + 1]
-            
-            tempo1 = track1.get("audio_features", {}).get("tempo", 120)
-            tempo2 = track2.get("audio_features", {}).get("tempo", 120)
-            
-            tempo_diff = abs(tempo2 - tempo1)
-            
-            # Detect large tempo jumps
-            if tempo_diff > 40:  # More than 40 BPM difference
-                issues.append({
-                    "type": "tempo_jump",
-                    "track_id": track2["id"],
-                    "track_name": track2["name"],
-                    "tempo1": tempo1,
-                    "tempo2": tempo2,
-                    "tempo_diff": tempo_diff
-                })
+            issues.append({
+                "type": "tempo_jump",
+                "track_id": track2["id"],
+                "track_name": track2["name"],
+                "tempo1": float(tempos[i]),
+                "tempo2": float(tempos[i + 1]),
+                "tempo_diff": float(tempo_diffs[i])
+            })
         
         return issues
     
@@ -598,17 +774,17 @@ class PlaylistOptimizationService:
         insights = track_performance.get("playlist_insights", {})
         tracks = tracks_data.get("tracks_list", [])
         
-        # Audio feature averages
+        # Audio feature averages, one column reduction over the imputed matrix
         if tracks:
-            energies = [t.get("audio_features", {}).get("energy", 0.5) for t in tracks]
-            valences = [t.get("audio_features", {}).get("valence", 0.5) for t in tracks]
-            danceabilities = [t.get("audio_features", {}).get("danceability", 0.5) for t in tracks]
+            features_arr = tracks_data["features_arr"]
+            averages = features_arr.mean(axis=0)
+            energies = features_arr[:, self.FEATURE_INDEX["energy"]]
             
             audio_metrics = {
-                "average_energy": statistics.mean(energies) if energies else 0.5,
-                "average_valence": statistics.mean(valences) if valences else 0.5,
-                "average_danceability": statistics.mean(danceabilities) if danceabilities else 0.5,
-                "energy_variance": statistics.variance(energies) if len(energies) > 1 else 0
+                "average_energy": float(averages[self.FEATURE_INDEX["energy"]]),
+                "average_valence": float(averages[self.FEATURE_INDEX["valence"]]),
+                "average_danceability": float(averages[self.FEATURE_INDEX["danceability"]]),
+                "energy_variance": float(energies.var(ddof=1)) if len(energies) > 1 else 0
             }
         else:
             audio_metrics = {}
@@ -627,20 +803,7 @@ class PlaylistOptimizationService:
         problematic_tracks = insights.get("problematic_tracks", 0)
         total_tracks = insights.get("total_tracks_analyzed", 1)
         
-        # Higher skip rate = more potential
-        skip_potential = min(skip_rate * 2, 1.0)
-        
-        # Lower quality = more potential
-        quality_potential = max(0, 1 - quality_score)
-        
-        # More problematic tracks = more potential
-        problematic_ratio = problematic_tracks / total_tracks
-        problematic_potential = min(problematic_ratio * 2, 1.0)
-        
-        # Average the potentials
-        overall_potential = (skip_potential + quality_potential + problematic_potential) / 3
-        
-        return min(overall_potential, 1.0)
+        return _potential_kernel(skip_rate, quality_score, problematic_tracks / total_tracks)
     
     def _generate_optimization_summary(
         self,
@@ -649,18 +812,23 @@ class PlaylistOptimizationService:
     ) -> Dict[str, Any]:
         """Generate a summary of optimization recommendations."""
         total_recs = len(recommendations)
-        high_priority = sum(1 for r in recommendations if r["priority"] == "high")
-        medium_priority = sum(1 for r in recommendations if r["priority"] == "medium")
-        low_priority = sum(1 for r in recommendations if r["priority"] == "low")
         
-        # Calculate potential impact
-        avg_impact = statistics.mean([r.get("impact_score", 0) for r in recommendations]) if recommendations else 0
-        
-        # Count recommendation types
-        type_counts = {}
+        # Count priorities and recommendation types and accumulate impact in one pass
+        priority_counts = Counter()
+        type_counts = Counter()
+        impact_sum = 0.0
         for rec in recommendations:
-            rec_type = rec["type"]
-            type_counts[rec_type] = type_counts.get(rec_type, 0) + 1
+            priority_counts[rec["priority"]] += 1
+            type_counts[rec["type"]] += 1
+            impact_sum += rec.get("impact_score", 0)
+        
+        # Recommendations arrive sorted by rank, so the best three lead the list
+        top_priorities = [
+            rec["title"] for rec in recommendations[:3] if rec["priority"] == "high"
+        ]
+        
+        # Calculate potential impact
+        avg_impact = impact_sum / total_recs if recommendations else 0
         
         metrics = playlist_data.get("metrics", {})
         optimization_potential = metrics.get("optimization_potential", 0)
@@ -668,20 +836,14 @@ class PlaylistOptimizationService:
         return {
             "total_recommendations": total_recs,
             "priority_breakdown": {
-                "high": high_priority,
-                "medium": medium_priority,
-                "low": low_priority
+                "high": priority_counts["high"],
+                "medium": priority_counts["medium"],
+                "low": priority_counts["low"]
             },
-            "recommendation_types": type_counts,
+            "recommendation_types": dict(type_counts),
             "potential_impact": avg_impact,
             "optimization_potential": optimization_potential,
             "estimated_improvement": min(avg_impact * optimization_potential, 1.0),
-            "top_priorities": [
-                rec["title"] for rec in recommendations[:3] if rec["priority"] == "high"
-            ]
+            "top_priorities": top_priorities
         }
-    
-    def _priority_score(self, priority: str) -> int:
-        """Convert priority string to numeric score for sorting."""
-        priority_map = {"high": 1, "medium": 2, "low": 3}
-        return priority_map.get(priority, 4)
+
@@ -2,11 +2,56 @@
 ReccoBeats API service for audio features extraction.
 This service replaces the deprecated Spotify audio features endpoint.
 """
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Mapping, Optional, Tuple
+from types import MappingProxyType
+import asyncio
+import operator
+import time
 import httpx
+import orjson
 import os
+import logging
 from dataclasses import dataclass
 
+from backend.services.http_retry import get_with_retry
+
+__all__ = ["ReccoBeatsConfig", "ReccoBeatsService", "close_shared_client"]
+
+logger = logging.getLogger(__name__)
+
+# Standard audio features we expect from ReccoBeats
+_EXPECTED_FEATURES = frozenset({
+    'danceability', 'energy', 'key', 'loudness', 'mode',
+    'speechiness', 'acousticness', 'instrumentalness',
+    'liveness', 'valence', 'tempo'
+})
+
+# Fixed feature order and a getter that reads all of them in one call, built once
+_FEATURE_NAMES = tuple(sorted(_EXPECTED_FEATURES))
+_get_all_features = operator.itemgetter(*_FEATURE_NAMES)
+
+# One pooled HTTP/2 client shared by every ReccoBeatsService instance so keep-alive
+# connections (and their TCP/TLS handshakes) are reused across calls. It is
+# bound to the event loop that created it and rebuilt if a new loop is running.
+_shared_client: Optional[httpx.AsyncClient] = None
+_shared_client_loop: Optional[asyncio.AbstractEventLoop] = None
+
+# Spotify ID -> (expires_at, ReccoBeats UUID or None for unknown tracks). The
+# mapping is effectively immutable, so it is shared across service instances.
+_uuid_cache: Dict[str, Tuple[float, Optional[str]]] = {}
+
+def _clean_spotify_id(track_id: str) -> str:
+    """Strip a Spotify URI prefix (spotify:track:...) down to the bare track ID."""
+    return track_id.rpartition(":")[2]
+
+async def close_shared_client() -> None:
+    """Close the shared ReccoBeats HTTP client, if one has been created."""
+    global _shared_client, _shared_client_loop
+    if _shared_client is not None and not _shared_client.is_closed:
+        await _shared_client.aclose()
+    _shared_client = None
+    _shared_client_loop = None
+
 @dataclass
 class ReccoBeatsConfig:
     """Configuration for ReccoBeats API."""
@@ -25,6 +70,24 @@ class ReccoBeatsService:
     Service for interacting with ReccoBeats API to extract audio features.
     """
     
+    # Upper bound on concurrent requests during bulk fetches
+    MAX_CONCURRENT_REQUESTS = 64
+    # Maximum number of IDs accepted by the bulk audio features endpoint
+    AUDIO_FEATURES_BATCH_SIZE = 40
+    # IDs sent per bulk track (UUID) lookup, kept to the same limit
+    TRACK_LOOKUP_BATCH_SIZE = 40
+    
+    # Lifetimes for cached UUID resolutions (seconds); unknown tracks are retried sooner
+    UUID_CACHE_TTL = 30 * 24 * 3600
+    UUID_NEGATIVE_CACHE_TTL = 24 * 3600
+    UUID_CACHE_MAX_ENTRIES = 100_000
+    
+    # Retry policy for idempotent GETs (backoff in seconds)
+    MAX_RETRIES = 3
+    RETRY_BACKOFF_BASE = 0.2
+    RETRY_BACKOFF_MAX = 2.0
+    RETRYABLE_STATUS_CODES = frozenset({429, 502, 503, 504})
+    
     def __init__(self, config: Optional[ReccoBeatsConfig] = None):
         """
         Initialize ReccoBeats service.
@@ -35,10 +98,15 @@ class ReccoBeatsService:
         self.config = config or ReccoBeatsConfig()
         
         # API key is optional for ReccoBeats - no authentication required
+        self._headers = MappingProxyType(self._build_headers())
+        
+        # Fixed endpoint URLs, formatted once rather than per request
+        self._track_url = f"{self.config.base_url}/track"
+        self._audio_features_url = f"{self.config.base_url}/audio-features"
     
-    def _get_headers(self) -> Dict[str, str]:
+    def _build_headers(self) -> Dict[str, str]:
         """
-        Get headers for ReccoBeats API requests.
+        Build headers for ReccoBeats API requests.
         
         Returns:
             Dict[str, str]: Request headers
@@ -55,6 +123,103 @@ class ReccoBeatsService:
         
         return headers
     
+    def _get_headers(self) -> Mapping[str, str]:
+        """
+        Get headers for ReccoBeats API requests.
+        
+        Returns:
+            Mapping[str, str]: Read-only request headers, built once per instance
+        """
+        return self._headers
+    
+    async def _ensure_client(self) -> httpx.AsyncClient:
+        """
+        Get the shared pooled HTTP client, creating it on first use.
+        
+        Returns:
+            httpx.AsyncClient: Client reused across requests and instances
+        """
+        global _shared_client, _shared_client_loop
+        loop = asyncio.get_running_loop()
+        if _shared_client is None or _shared_client.is_closed or _shared_client_loop is not loop:
+            _shared_client = httpx.AsyncClient(
+                http2=True,
+                timeout=self.config.timeout,
+                limits=httpx.Limits(
+                    max_connections=100,
+                    max_keepalive_connections=50,
+                    keepalive_expiry=60
+                )
+            )
+            _shared_client_loop = loop
+        return _shared_client
+    
+    async def _get_with_retry(self, url: str, **kwargs) -> httpx.Response:
+        """
+        GET a ReccoBeats endpoint on the shared client, retrying transient failures.
+        
+        Transport errors and retryable status codes (429, 502, 503, 504) are
+        retried up to MAX_RETRIES times with jittered exponential backoff; a
+        Retry-After header on 429 responses takes precedence, up to
+        http_retry.MAX_RETRY_AFTER seconds.
+        
+        Args:
+            url: Endpoint URL
+            **kwargs: Passed through to httpx.AsyncClient.get
+            
+        Returns:
+            httpx.Response: The final response
+        """
+        client = await self._ensure_client()
+        return await get_with_retry(
+            client,
+            url,
+            max_retries=self.MAX_RETRIES,
+            retryable_status_codes=self.RETRYABLE_STATUS_CODES,
+            backoff_base=self.RETRY_BACKOFF_BASE,
+            backoff_max=self.RETRY_BACKOFF_MAX,
+            **kwargs
+        )
+    
+    async def _get_json(
+        self,
+        url: str,
+        params: Optional[Dict[str, str]] = None,
+        *,
+        context: str,
+        not_found_msg: Optional[str] = None
+    ) -> Optional[Any]:
+        """
+        GET a ReccoBeats endpoint and decode its JSON body.
+        
+        Args:
+            url: Endpoint URL
+            params: Query parameters
+            context: What is being fetched, used in log messages
+            not_found_msg: Logged at INFO instead of a warning when the endpoint returns 404
+            
+        Returns:
+            Any | None: Decoded JSON on a 200 response, else None
+        """
+        try:
+            response = await self._get_with_retry(url, params=params, headers=self._headers)
+            if response.status_code == 200:
+                return orjson.loads(response.content)
+            
+            if response.status_code == 404 and not_found_msg:
+                logger.info("%s", not_found_msg)
+            elif logger.isEnabledFor(logging.WARNING):
+                logger.warning("ReccoBeats %s error %s: %s", context, response.status_code, response.text[:200])
+            return None
+        
+        except Exception as e:
+            logger.error("Error fetching %s: %s", context, e)
+            return None
+    
+    async def aclose(self) -> None:
+        """Close the shared HTTP client used by this service."""
+        await close_shared_client()
+    
     async def get_track_audio_features(self, track_id: str) -> Optional[Dict[str, Any]]:
         """
         Get audio features for a single track from ReccoBeats API.
@@ -75,24 +240,11 @@ class ReccoBeatsService:
             return None
         
         # Step 2: Get audio features using the UUID
-        url = f"{self.config.base_url}/track/{reccobeats_uuid}/audio-features"
-        
-        try:
-            async with httpx.AsyncClient(timeout=self.config.timeout) as client:
-                response = await client.get(url, headers=self._get_headers())
-                
-                if response.status_code == 200:
-                    return response.json()
-                elif response.status_code == 404:
-                    print(f"❌ Audio features not found for ReccoBeats UUID: {reccobeats_uuid}")
-                    return None
-                else:
-                    print(f"ReccoBeats audio features error {response.status_code}: {response.text[:200]}")
-                    return None
-                    
-        except Exception as e:
-            print(f"Error fetching audio features for {track_id}: {e}")
-            return None
+        return await self._get_json(
+            f"{self.config.base_url}/track/{reccobeats_uuid}/audio-features",
+            context=f"audio features for {track_id}",
+            not_found_msg=f"Audio features not found for ReccoBeats UUID: {reccobeats_uuid}"
+        )
 
     async def _get_reccobeats_uuid(self, spotify_track_id: str) -> Optional[str]:
         """
@@ -105,149 +257,30 @@ class ReccoBeatsService:
             str | None: ReccoBeats internal UUID if found, else None
         """
         # Clean the Spotify track ID
-        clean_id = spotify_track_id.split(":")[-1]
-        
-        url = f"{self.config.base_url}/track"
-        
-        try:
-            async with httpx.AsyncClient(timeout=self.config.timeout) as client:
-                response = await client.get(
-                    url, 
-                    params={"ids": clean_id},
-                    headers=self._get_headers()
-                )
-                
-                if response.status_code == 200:
-                    data = response.json()
-                    if "content" in data and data["content"]:
-                        # Return the ReccoBeats internal ID
-                        return data["content"][0].get("id")
-                    else:
-                        print(f"❌ Track not found in ReccoBeats: {clean_id}")
-                        return None
-                else:
-                    print(f"ReccoBeats track lookup error {response.status_code}: {response.text[:200]}")
-                    return None
-                    
-        except Exception as e:
-            print(f"Error getting ReccoBeats UUID for {spotify_track_id}: {e}")
+        clean_id = _clean_spotify_id(spotify_track_id)
+        
+        cached = _uuid_cache.get(clean_id)
+        if cached is not None and cached[0] > time.monotonic():
+            return cached[1]
+        
+        data = await self._get_json(
+            self._track_url,
+            params={"ids": clean_id},
+            context=f"track lookup for {spotify_track_id}"
+        )
+        if data is None:
             return None
-
-    async def get_multiple_tracks_audio_features(self, track_ids: List[str]) -> Dict[str, Dict[str, Any]]:
-        """
-        Get audio features for multiple tracks from ReccoBeats API in bulk.
-
-        Args:
-            track_ids: A list of Spotify track IDs.
-
-        Returns:
-            A dictionary mapping Spotify track IDs to their audio features.
-        """
-        if not track_ids:
-            return {}
-        print(f"ReccoBeats: Getting audio features for {len(track_ids)} tracks.")
-
-        # Step 1: Get ReccoBeats internal UUIDs for all Spotify IDs
-        uuid_map = await self._get_multiple_reccobeats_uuids(track_ids)
-        if not uuid_map:
-            print("ReccoBeats: No UUIDs found, aborting audio feature fetch.")
-            return {}
-        print(f"ReccoBeats: UUID map received: {uuid_map}")
-
-        reccobeats_uuids = list(uuid_map.values())
-        print(f"ReccoBeats: Fetching features for UUIDs: {reccobeats_uuids}")
         
-        # Step 2: Fetch audio features in bulk using the UUIDs
-        url = f"{self.config.base_url}/audio-features"
-        try:
-            async with httpx.AsyncClient(timeout=self.config.timeout) as client:
-                response = await client.get(
-                    url,
-                    params={"ids": ",".join(reccobeats_uuids)},
-                    headers=self._get_headers()
-                )
-                print(f"ReccoBeats audio features response: {response.status_code}")
-
-                if response.status_code != 200:
-                    print(f"ReccoBeats bulk audio features error {response.status_code}: {response.text[:200]}")
-                    return {}
-
-                features_data = response.json().get("audio_features", [])
-                print(f"ReccoBeats audio features response data: {features_data}")
-                if not features_data:
-                    return {}
-
-                # Create a map from ReccoBeats UUID back to features
-                features_by_uuid = {f["id"]: f for f in features_data if f}
-
-                # Map features back to the original Spotify IDs
-                result = {}
-                for spotify_id, reccobeats_uuid in uuid_map.items():
-                    if reccobeats_uuid in features_by_uuid:
-                        result[spotify_id] = features_by_uuid[reccobeats_uuid]
-                
-                print(f"ReccoBeats: Successfully mapped {len(result)} features back to Spotify IDs.")
-                return result
-
-        except Exception as e:
-            print(f"Error fetching bulk audio features: {e}")
-            return {}
-
-    async def _get_multiple_reccobeats_uuids(self, spotify_track_ids: List[str]) -> Dict[str, str]:
-        """
-        Get ReccoBeats internal UUIDs for a list of Spotify track IDs in bulk.
-
-        Args:
-            spotify_track_ids: A list of Spotify track IDs.
-
-        Returns:
-            A dictionary mapping Spotify track IDs to ReccoBeats internal UUIDs.
-        """
-        print(f"ReccoBeats: Getting UUIDs for {len(spotify_track_ids)} Spotify IDs.")
-        clean_ids = list(set([tid.split(":")[-1] for tid in spotify_track_ids]))
-        print(f"ReccoBeats: Cleaned IDs to fetch: {clean_ids}")
-        url = f"{self.config.base_url}/track"
+        if data.get("content"):
+            # Return the ReccoBeats internal ID
+            reccobeats_uuid = data["content"][0].get("id")
+            self._cache_uuid(clean_id, reccobeats_uuid)
+            return reccobeats_uuid
         
-        try:
-            async with httpx.AsyncClient(timeout=self.config.timeout) as client:
-                response = await client.get(
-                    url,
-                    params={"ids": ",".join(clean_ids)},
-                    headers=self._get_headers()
-                )
-                print(f"ReccoBeats UUID lookup response: {response.status_code}")
-
-                if response.status_code != 200:
-                    print(f"ReccoBeats bulk track lookup error {response.status_code}: {response.text[:200]}")
-                    return {}
+        logger.info("Track not found in ReccoBeats: %s", clean_id)
+        self._cache_uuid(clean_id, None)
+        return None
 
-                data = response.json()
-                print(f"ReccoBeats UUID lookup response data: {data}")
-                if "content" in data and data["content"]:
-                    # The API returns a list, so we need to map IDs back
-                    spotify_id_map = {item.get("spotify_id"): item.get("id") for item in data["content"] if item.get("spotify_id") and item.get("id")}
-                    print(f"ReccoBeats: Found {len(spotify_id_map)} UUIDs.")
-                    return spotify_id_map
-                return {}
-
-        except Exception as e:
-            print(f"Error getting bulk ReccoBeats UUIDs: {e}")
-            return {}
-
-    def map_features_to_spotify_format(self, features: Dict[str, Any]) -> Dict[str, Any]:
-        """
-        Maps feature names from ReccoBeats format to Spotify/model format.
-        Currently, the names are assumed to be identical.
-
-        Args:
-            features: A dictionary of audio features from ReccoBeats.
-
-        Returns:
-            A dictionary with keys matching the Track model fields.
-        """
-        # Assuming direct mapping for now as keys seem to match
-        return features
-    
     async def get_track_details(self, track_id: str) -> Optional[Dict[str, Any]]:
         """
         Get track details from ReccoBeats API.
@@ -258,27 +291,18 @@ class ReccoBeatsService:
         Returns:
             Dict[str, Any]: Track details or None if request fails
         """
-        url = f"{self.config.base_url}/track/{track_id}"
-        
-        try:
-            async with httpx.AsyncClient(timeout=self.config.timeout) as client:
-                response = await client.get(url, headers=self._get_headers())
-                
-                if response.status_code == 200:
-                    return response.json()
-                else:
-                    print(f"ReccoBeats track details error: {response.status_code} - {response.text}")
-                    return None
-                    
-        except Exception as e:
-            print(f"Error fetching track details for {track_id}: {e}")
-            return None
+        return await self._get_json(
+            f"{self.config.base_url}/track/{track_id}",
+            context=f"track details for {track_id}"
+        )
     
     async def get_multiple_tracks_audio_features(self, track_ids: List[str]) -> Dict[str, Dict[str, Any]]:
         """
         Get audio features for multiple tracks using the two-step ReccoBeats process:
         1. Get track info with Spotify IDs to retrieve ReccoBeats UUIDs
-        2. Use UUIDs to fetch audio features individually
+        2. Use UUIDs to fetch audio features from the bulk endpoint
+        
+        Features for tracks with cached UUIDs are fetched while step 1 runs.
         
         Args:
             track_ids: List of Spotify track IDs
@@ -286,53 +310,102 @@ class ReccoBeatsService:
         Returns:
             Dict[str, Dict[str, Any]]: Mapping of Spotify track_id to audio features
         """
-        features_map = {}
-        
-        print(f"🎵 Fetching audio features for {len(track_ids)} tracks from ReccoBeats...")
-        
-        # Step 1: Get ReccoBeats UUIDs for all tracks in bulk
-        print("� Step 1: Getting ReccoBeats UUIDs for all tracks...")
-        uuid_mapping = await self._get_multiple_reccobeats_uuids(track_ids)
-        
-        if not uuid_mapping:
-            print("❌ No tracks found in ReccoBeats")
+        logger.info("Fetching audio features for %d tracks from ReccoBeats", len(track_ids))
+        
+        # Tracks whose UUIDs are already cached can start fetching features
+        # right away, overlapping with the UUID lookup for the rest
+        clean_ids = list(dict.fromkeys(_clean_spotify_id(tid) for tid in track_ids))
+        cached_mapping, missing_ids = self._partition_cached_uuids(clean_ids)
+        semaphore = asyncio.Semaphore(self.MAX_CONCURRENT_REQUESTS)
+        cached_features_task = asyncio.create_task(
+            self._fetch_features_bulk(cached_mapping, semaphore)
+        )
+        
+        # Step 1: Get ReccoBeats UUIDs for the uncached tracks in bulk
+        logger.debug("Step 1: Getting ReccoBeats UUIDs for %d uncached tracks", len(missing_ids))
+        resolved_mapping = await self._get_multiple_reccobeats_uuids(missing_ids)
+        
+        found_count = len(cached_mapping) + len(resolved_mapping)
+        if not found_count:
+            await cached_features_task
+            logger.info("No tracks found in ReccoBeats")
             return {}
         
-        print(f"✅ Found ReccoBeats UUIDs for {len(uuid_mapping)}/{len(track_ids)} tracks")
+        logger.info("Found ReccoBeats UUIDs for %d/%d tracks", found_count, len(clean_ids))
         
-        # Step 2: Get audio features using the UUIDs
-        print("🎶 Step 2: Fetching audio features using UUIDs...")
+        # Step 2: Get audio features for the newly resolved UUIDs
+        logger.debug("Step 2: Fetching audio features using UUIDs")
+        resolved_features = await self._fetch_features_bulk(resolved_mapping, semaphore)
+        features_map = await cached_features_task
+        features_map.update(resolved_features)
         
-        # Process in chunks to avoid overwhelming the API
-        CHUNK_SIZE = 10
-        spotify_ids = list(uuid_mapping.keys())
+        logger.info("Fetched audio features for %d/%d tracks", len(features_map), len(clean_ids))
+        return features_map
+    
+    async def _fetch_features_bulk(
+        self,
+        uuid_mapping: Dict[str, str],
+        semaphore: asyncio.Semaphore
+    ) -> Dict[str, Dict[str, Any]]:
+        """
+        Fetch audio features for resolved tracks using the bulk endpoint.
         
-        for i in range(0, len(spotify_ids), CHUNK_SIZE):
-            chunk_spotify_ids = spotify_ids[i:i + CHUNK_SIZE]
-            
-            # Process chunk concurrently
-            import asyncio
-            tasks = []
-            for spotify_id in chunk_spotify_ids:
-                reccobeats_uuid = uuid_mapping[spotify_id]
-                task = self._get_audio_features_by_uuid(reccobeats_uuid, spotify_id)
-                tasks.append(task)
-            
-            results = await asyncio.gather(*tasks, return_exceptions=True)
-            
-            # Map results back to Spotify track IDs
-            for spotify_id, result in zip(chunk_spotify_ids, results):
-                if isinstance(result, dict) and result:
-                    features_map[spotify_id] = result
-                elif isinstance(result, Exception):
-                    print(f"Exception for track {spotify_id}: {result}")
+        Args:
+            uuid_mapping: Mapping of Spotify track ID to ReccoBeats UUID
+            semaphore: Limits concurrent batch requests
             
-            # Add delay between chunks to respect rate limits
-            if i + CHUNK_SIZE < len(spotify_ids):
-                await asyncio.sleep(0.1)  # 100ms delay
+        Returns:
+            Dict[str, Dict[str, Any]]: Mapping of Spotify track ID to audio features
+        """
+        features_map = {}
+        if not uuid_mapping:
+            return features_map
+        
+        # One bulk request per batch of UUIDs, all batches in flight at once;
+        # the semaphore bounds concurrency instead of sleeping between chunks
+        async def fetch(batch: List[str]) -> Dict[str, Dict[str, Any]]:
+            async with semaphore:
+                return await self._get_audio_features_batch(batch, spotify_id_by_uuid)
+        
+        spotify_id_by_uuid = {uuid: spotify_id for spotify_id, uuid in uuid_mapping.items()}
+        reccobeats_uuids = list(spotify_id_by_uuid)
+        batches = [
+            reccobeats_uuids[i:i + self.AUDIO_FEATURES_BATCH_SIZE]
+            for i in range(0, len(reccobeats_uuids), self.AUDIO_FEATURES_BATCH_SIZE)
+        ]
+        
+        # Map each batch back to Spotify IDs as soon as it arrives, so parsing
+        # and mapping overlap with the batches still in flight
+        for next_batch in asyncio.as_completed([fetch(batch) for batch in batches]):
+            try:
+                features_map.update(await next_batch)
+            except Exception as e:
+                logger.error("Exception fetching audio features batch: %s", e)
         
-        print(f"✅ Successfully fetched audio features for {len(features_map)}/{len(track_ids)} tracks")
         return features_map
+    
+    def _partition_cached_uuids(self, clean_ids: List[str]) -> Tuple[Dict[str, str], List[str]]:
+        """
+        Split Spotify IDs into cached UUID resolutions and IDs that still need a lookup.
+        
+        Args:
+            clean_ids: Deduplicated, cleaned Spotify track IDs
+            
+        Returns:
+            Tuple[Dict[str, str], List[str]]: Cached Spotify ID to UUID mapping
+            (known-unknown tracks omitted) and the IDs missing from the cache
+        """
+        uuid_mapping = {}
+        missing_ids = []
+        now = time.monotonic()
+        for clean_id in clean_ids:
+            cached = _uuid_cache.get(clean_id)
+            if cached is not None and cached[0] > now:
+                if cached[1] is not None:
+                    uuid_mapping[clean_id] = cached[1]
+            else:
+                missing_ids.append(clean_id)
+        return uuid_mapping, missing_ids
 
     async def _get_multiple_reccobeats_uuids(self, spotify_track_ids: List[str]) -> Dict[str, str]:
         """
@@ -347,40 +420,64 @@ class ReccoBeatsService:
         if not spotify_track_ids:
             return {}
         
-        # Clean track IDs
-        clean_ids = [tid.split(":")[-1] for tid in spotify_track_ids]
-        ids_param = ",".join(clean_ids)
+        # Clean and dedupe track IDs, preserving order
+        clean_ids = list(dict.fromkeys(_clean_spotify_id(tid) for tid in spotify_track_ids))
         
-        url = f"{self.config.base_url}/track"
-        uuid_mapping = {}
+        # Serve known mappings from the cache; only misses hit the network
+        uuid_mapping, missing_ids = self._partition_cached_uuids(clean_ids)
         
-        try:
-            async with httpx.AsyncClient(timeout=self.config.timeout) as client:
-                response = await client.get(
-                    url, 
-                    params={"ids": ids_param},
-                    headers=self._get_headers()
+        if not missing_ids:
+            return uuid_mapping
+        
+        # One lookup per batch of IDs, all batches in flight at once
+        semaphore = asyncio.Semaphore(self.MAX_CONCURRENT_REQUESTS)
+        
+        async def lookup(batch: List[str]) -> Dict[str, str]:
+            async with semaphore:
+                data = await self._get_json(
+                    self._track_url,
+                    params={"ids": ",".join(batch)},
+                    context="bulk track lookup"
                 )
-                
-                if response.status_code == 200:
-                    data = response.json()
-                    
-                    if "content" in data:
-                        for track in data["content"]:
-                            # Extract Spotify ID from href and map to ReccoBeats UUID
-                            if "href" in track and "spotify.com/track/" in track["href"] and "id" in track:
-                                spotify_id = track["href"].split("/")[-1]
-                                reccobeats_uuid = track["id"]
-                                uuid_mapping[spotify_id] = reccobeats_uuid
-                    
-                    return uuid_mapping
-                else:
-                    print(f"ReccoBeats bulk track lookup error: {response.status_code} - {response.text[:200]}")
-                    return {}
-                    
-        except Exception as e:
-            print(f"Error getting ReccoBeats UUIDs: {e}")
-            return {}
+            if data is None:
+                # Nothing is known about a failed batch, so none of it is cached
+                return {}
+            
+            fetched = {}
+            for track in data.get("content", []):
+                # Extract Spotify ID from href and map to ReccoBeats UUID
+                if "href" in track and "spotify.com/track/" in track["href"] and "id" in track:
+                    spotify_id = track["href"].split("/")[-1]
+                    reccobeats_uuid = track["id"]
+                    fetched[spotify_id] = reccobeats_uuid
+            
+            # Remember hits and misses so unknown tracks are not re-queried; only
+            # IDs sent in this successful request count as misses
+            for clean_id in batch:
+                self._cache_uuid(clean_id, fetched.get(clean_id))
+            return fetched
+        
+        batches = [
+            missing_ids[i:i + self.TRACK_LOOKUP_BATCH_SIZE]
+            for i in range(0, len(missing_ids), self.TRACK_LOOKUP_BATCH_SIZE)
+        ]
+        for fetched in await asyncio.gather(*(lookup(batch) for batch in batches)):
+            uuid_mapping.update(fetched)
+        return uuid_mapping
+    
+    def _cache_uuid(self, spotify_id: str, reccobeats_uuid: Optional[str]) -> None:
+        """
+        Cache a Spotify ID to ReccoBeats UUID resolution, evicting the oldest entries when full.
+        
+        Args:
+            spotify_id: Clean Spotify track ID
+            reccobeats_uuid: Resolved ReccoBeats UUID, or None if the track is unknown
+        """
+        ttl = self.UUID_CACHE_TTL if reccobeats_uuid is not None else self.UUID_NEGATIVE_CACHE_TTL
+        _uuid_cache.pop(spotify_id, None)
+        while len(_uuid_cache) >= self.UUID_CACHE_MAX_ENTRIES:
+            del _uuid_cache[next(iter(_uuid_cache))]
+        _uuid_cache[spotify_id] = (time.monotonic() + ttl, reccobeats_uuid)
 
     async def _get_audio_features_by_uuid(self, reccobeats_uuid: str, spotify_id: str) -> Optional[Dict[str, Any]]:
         """
@@ -393,24 +490,42 @@ class ReccoBeatsService:
         Returns:
             Dict[str, Any] | None: Audio features if found, else None
         """
-        url = f"{self.config.base_url}/track/{reccobeats_uuid}/audio-features"
+        return await self._get_json(
+            f"{self.config.base_url}/track/{reccobeats_uuid}/audio-features",
+            context=f"audio features for {spotify_id}",
+            not_found_msg=f"Audio features not available for {spotify_id} (UUID: {reccobeats_uuid})"
+        )
+
+    async def _get_audio_features_batch(
+        self,
+        reccobeats_uuids: List[str],
+        spotify_id_by_uuid: Dict[str, str]
+    ) -> Dict[str, Dict[str, Any]]:
+        """
+        Get audio features for a batch of ReccoBeats UUIDs in one request.
         
-        try:
-            async with httpx.AsyncClient(timeout=self.config.timeout) as client:
-                response = await client.get(url, headers=self._get_headers())
-                
-                if response.status_code == 200:
-                    return response.json()
-                elif response.status_code == 404:
-                    print(f"❌ Audio features not available for {spotify_id} (UUID: {reccobeats_uuid})")
-                    return None
-                else:
-                    print(f"ReccoBeats audio features error for {spotify_id}: {response.status_code}")
-                    return None
-                    
-        except Exception as e:
-            print(f"Error fetching audio features for {spotify_id}: {e}")
-            return None
+        Args:
+            reccobeats_uuids: ReccoBeats internal UUIDs (at most AUDIO_FEATURES_BATCH_SIZE)
+            spotify_id_by_uuid: Reverse mapping of ReccoBeats UUID to Spotify track ID
+            
+        Returns:
+            Dict[str, Dict[str, Any]]: Mapping of Spotify track ID to audio features
+        """
+        data = await self._get_json(
+            self._audio_features_url,
+            params={"ids": ",".join(reccobeats_uuids)},
+            context="bulk audio features"
+        )
+        if data is None:
+            return {}
+        
+        features_data = data.get("content") or data.get("audio_features") or []
+        # Resolve straight to Spotify IDs in the same pass that filters the payload
+        return {
+            spotify_id_by_uuid[f["id"]]: f
+            for f in features_data
+            if f and f.get("id") in spotify_id_by_uuid
+        }
 
     async def get_multiple_tracks_info(self, track_ids: List[str]) -> Dict[str, Dict[str, Any]]:
         """
@@ -426,40 +541,25 @@ class ReccoBeatsService:
             return {}
             
         # Clean track IDs
-        clean_ids = [tid.split(":")[-1] for tid in track_ids]
-        ids_param = ",".join(clean_ids)
+        clean_ids = [_clean_spotify_id(tid) for tid in track_ids]
+        data = await self._get_json(
+            self._track_url,
+            params={"ids": ",".join(clean_ids)},
+            context="bulk tracks"
+        )
+        if data is None:
+            return {}
         
-        url = f"{self.config.base_url}/track"
+        # Map response content to track IDs
+        tracks_data = {}
+        for track in data.get("content", []):
+            # Extract Spotify ID from href if available
+            if "href" in track and "spotify.com/track/" in track["href"]:
+                spotify_id = track["href"].split("/")[-1]
+                tracks_data[spotify_id] = track
         
-        try:
-            async with httpx.AsyncClient(timeout=self.config.timeout) as client:
-                response = await client.get(
-                    url, 
-                    params={"ids": ids_param},
-                    headers=self._get_headers()
-                )
-                
-                if response.status_code == 200:
-                    data = response.json()
-                    tracks_data = {}
-                    
-                    # Map response content to track IDs
-                    if "content" in data:
-                        for track in data["content"]:
-                            # Extract Spotify ID from href if available
-                            if "href" in track and "spotify.com/track/" in track["href"]:
-                                spotify_id = track["href"].split("/")[-1]
-                                tracks_data[spotify_id] = track
-                    
-                    print(f"✅ Found {len(tracks_data)} tracks in ReccoBeats bulk endpoint")
-                    return tracks_data
-                else:
-                    print(f"ReccoBeats bulk tracks error: {response.status_code} - {response.text[:200]}")
-                    return {}
-                    
-        except Exception as e:
-            print(f"Error fetching bulk tracks: {e}")
-            return {}
+        logger.info("Found %d tracks in ReccoBeats bulk endpoint", len(tracks_data))
+        return tracks_data
     
     async def extract_audio_features(self, audio_data: Any) -> Optional[Dict[str, Any]]:
         """
@@ -474,21 +574,21 @@ class ReccoBeatsService:
         url = f"{self.config.base_url}/analysis/audio-features"
         
         try:
-            async with httpx.AsyncClient(timeout=self.config.timeout) as client:
-                response = await client.post(
-                    url, 
-                    headers=self._get_headers(),
-                    json=audio_data  # Adjust based on API requirements
-                )
+            client = await self._ensure_client()
+            response = await client.post(
+                url, 
+                headers=self._headers,
+                content=orjson.dumps(audio_data)  # Adjust based on API requirements
+            )
                 
-                if response.status_code == 200:
-                    return response.json()
-                else:
-                    print(f"ReccoBeats analysis error: {response.status_code} - {response.text}")
-                    return None
+            if response.status_code == 200:
+                return orjson.loads(response.content)
+            else:
+                logger.warning("ReccoBeats analysis error: %s - %s", response.status_code, response.text)
+                return None
                     
         except Exception as e:
-            print(f"Error extracting audio features: {e}")
+            logger.error("Error extracting audio features: %s", e)
             return None
     
     def map_features_to_spotify_format(self, reccobeats_features: Dict[str, Any]) -> Dict[str, Any]:
@@ -502,25 +602,15 @@ class ReccoBeatsService:
             Dict[str, Any]: Features mapped to match our database schema
         """
         # This mapping will need to be adjusted based on actual ReccoBeats response format
-        # For now, assume similar structure to Spotify
-        
-        # Standard audio features we expect
-        expected_features = [
-            'danceability', 'energy', 'key', 'loudness', 'mode',
-            'speechiness', 'acousticness', 'instrumentalness', 
-            'liveness', 'valence', 'tempo'
-        ]
-        
-        mapped_features = {}
-        
-        for feature in expected_features:
-            # Try direct mapping first
-            if feature in reccobeats_features:
-                mapped_features[feature] = reccobeats_features[feature]
-            # Add any custom mapping logic here based on ReccoBeats API response
-            # e.g., if ReccoBeats uses different field names
-        
-        return mapped_features
+        # For now, assume similar structure to Spotify. Complete payloads are read
+        # with one itemgetter call; partial ones copy whichever expected features
+        # are present (set intersection runs in C)
+        if _EXPECTED_FEATURES <= reccobeats_features.keys():
+            return dict(zip(_FEATURE_NAMES, _get_all_features(reccobeats_features)))
+        return {
+            feature: reccobeats_features[feature]
+            for feature in _EXPECTED_FEATURES & reccobeats_features.keys()
+        }
 
 
 # Example usage and testing
@@ -22,10 +22,18 @@ if __name__ == "__main__":
     print("🔗 API will be available at: http://localhost:8000")
     print("📖 API docs at: http://localhost:8000/docs")
     
+    # Auto-reload is a development convenience (watcher thread + process
+    # restarts); set BACKEND_RELOAD=0 in production to run worker processes
+    reload = os.getenv("BACKEND_RELOAD", "1") != "0"
+    
     uvicorn.run(
         "backend.main:app",
         host="0.0.0.0",
         port=8000,
-        reload=True,
+        reload=reload,
+        workers=None if reload else os.cpu_count(),
+        # uvloop and httptools ship with uvicorn[standard]; uvloop has no Windows build
+        loop="asyncio" if sys.platform == "win32" else "uvloop",
+        http="httptools",
         log_level="info"
     )
@@ -0,0 +1,63 @@
+"""
+Tests for audio feature imputation.
+"""
+import math
+
+import pytest
+
+from backend.models import Track
+from backend.services.audio_features import AudioFeaturesService
+
+COMPLETE_FEATURES = {
+    "danceability": 0.6, "energy": 0.7, "key": 5, "loudness": -6.0, "mode": 1,
+    "speechiness": 0.05, "acousticness": 0.2, "instrumentalness": 0.0,
+    "liveness": 0.1, "valence": 0.4, "tempo": 118.0
+}
+
+
+@pytest.fixture
+def service():
+    return AudioFeaturesService()
+
+
+def make_track(index, **overrides):
+    features = {feature: value + index * 0.01 for feature, value in COMPLETE_FEATURES.items()}
+    features.update(overrides)
+    return Track(spotify_track_id=f"track{index}", name=f"Track {index}", artist="Artist", **features)
+
+
+def test_sparse_columns_are_filled_with_defaults(service):
+    # tempo is missing everywhere and valence is known for one track only, so
+    # neither has enough values for KNN and both fall back to FEATURE_DEFAULTS
+    tracks = [make_track(i, tempo=None, valence=None) for i in range(4)]
+    tracks[0].valence = 0.9
+
+    service._impute_missing_features(tracks)
+
+    assert [t.tempo for t in tracks] == [service.FEATURE_DEFAULTS["tempo"]] * 4
+    assert tracks[0].valence == pytest.approx(0.9)
+    assert [t.valence for t in tracks[1:]] == [service.FEATURE_DEFAULTS["valence"]] * 3
+    assert tracks[2].energy == pytest.approx(COMPLETE_FEATURES["energy"] + 0.02)
+    assert all(t.features_imputed for t in tracks)
+
+
+def test_dense_columns_are_imputed_from_neighbours(service):
+    tracks = [make_track(i) for i in range(6)]
+    tracks[3].energy = None
+
+    service._impute_missing_features(tracks)
+
+    assert not math.isnan(tracks[3].energy)
+    assert min(t.energy for t in tracks if t is not tracks[3]) <= tracks[3].energy
+    assert tracks[3].energy <= max(t.energy for t in tracks if t is not tracks[3])
+
+
+def test_all_missing_features_fall_back_to_defaults(service):
+    tracks = [make_track(i, **{feature: None for feature in COMPLETE_FEATURES}) for i in range(2)]
+
+    service._impute_missing_features(tracks)
+
+    for track in tracks:
+        for feature, default in service.FEATURE_DEFAULTS.items():
+            assert getattr(track, feature) == default
+        assert track.features_imputed
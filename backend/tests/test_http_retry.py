@@ -0,0 +1,147 @@
+"""
+Tests for the shared HTTP retry helper.
+"""
+import asyncio
+
+import httpx
+import pytest
+
+from backend.services import http_retry
+from backend.services.http_retry import MAX_RETRY_AFTER, get_with_retry
+
+RETRY_POLICY = dict(
+    max_retries=3,
+    retryable_status_codes={429, 503},
+    backoff_base=0.1,
+    backoff_max=0.4,
+)
+
+
+@pytest.fixture
+def sleeps(monkeypatch):
+    """Record the delays get_with_retry sleeps for instead of waiting."""
+    delays = []
+
+    async def fake_sleep(delay):
+        delays.append(delay)
+
+    monkeypatch.setattr(http_retry.asyncio, "sleep", fake_sleep)
+    return delays
+
+
+def make_client(*responses):
+    """Client that serves the given responses (or raises the given exceptions) in order."""
+    queue = list(responses)
+    calls = []
+
+    def handler(request):
+        calls.append(request)
+        item = queue.pop(0)
+        if isinstance(item, Exception):
+            raise item
+        return item
+
+    return httpx.AsyncClient(transport=httpx.MockTransport(handler)), calls
+
+
+@pytest.mark.asyncio
+async def test_returns_first_non_retryable_response(sleeps):
+    client, calls = make_client(httpx.Response(404))
+
+    response = await get_with_retry(client, "https://api.example/x", **RETRY_POLICY)
+
+    assert response.status_code == 404
+    assert len(calls) == 1
+    assert sleeps == []
+
+
+@pytest.mark.asyncio
+async def test_retries_with_bounded_jittered_backoff(sleeps):
+    client, calls = make_client(httpx.Response(503), httpx.Response(503), httpx.Response(200))
+
+    response = await get_with_retry(client, "https://api.example/x", **RETRY_POLICY)
+
+    assert response.status_code == 200
+    assert len(calls) == 3
+    assert 0.05 <= sleeps[0] <= 0.1
+    assert 0.1 <= sleeps[1] <= 0.2
+
+
+@pytest.mark.asyncio
+async def test_returns_last_response_when_retries_run_out(sleeps):
+    client, calls = make_client(*[httpx.Response(503) for _ in range(4)])
+
+    response = await get_with_retry(client, "https://api.example/x", **RETRY_POLICY)
+
+    assert response.status_code == 503
+    assert len(calls) == 4
+    assert len(sleeps) == 3
+
+
+@pytest.mark.asyncio
+async def test_honours_retry_after_within_cap(sleeps):
+    client, _ = make_client(
+        httpx.Response(429, headers={"Retry-After": "2"}),
+        httpx.Response(200),
+    )
+
+    response = await get_with_retry(client, "https://api.example/x", **RETRY_POLICY)
+
+    assert response.status_code == 200
+    assert sleeps == [2.0]
+
+
+@pytest.mark.asyncio
+async def test_fails_fast_when_retry_after_exceeds_cap(sleeps):
+    client, calls = make_client(
+        httpx.Response(429, headers={"Retry-After": str(MAX_RETRY_AFTER + 1)}),
+        httpx.Response(200),
+    )
+
+    response = await get_with_retry(client, "https://api.example/x", **RETRY_POLICY)
+
+    assert response.status_code == 429
+    assert len(calls) == 1
+    assert sleeps == []
+
+
+@pytest.mark.asyncio
+async def test_unparseable_retry_after_falls_back_to_backoff(sleeps):
+    client, _ = make_client(
+        httpx.Response(429, headers={"Retry-After": "soon"}),
+        httpx.Response(200),
+    )
+
+    response = await get_with_retry(client, "https://api.example/x", **RETRY_POLICY)
+
+    assert response.status_code == 200
+    assert 0.05 <= sleeps[0] <= 0.1
+
+
+@pytest.mark.asyncio
+async def test_transport_errors_are_retried_then_raised(sleeps):
+    request = httpx.Request("GET", "https://api.example/x")
+    client, calls = make_client(*[httpx.ConnectError("down", request=request) for _ in range(4)])
+
+    with pytest.raises(httpx.ConnectError):
+        await get_with_retry(client, "https://api.example/x", **RETRY_POLICY)
+
+    assert len(calls) == 4
+
+
+@pytest.mark.asyncio
+async def test_limiter_is_held_around_each_attempt(sleeps):
+    entered = []
+
+    class Limiter:
+        async def __aenter__(self):
+            entered.append(True)
+
+        async def __aexit__(self, *exc_info):
+            return None
+
+    client, _ = make_client(httpx.Response(503), httpx.Response(200))
+
+    await get_with_retry(client, "https://api.example/x", limiter=Limiter(), **RETRY_POLICY)
+
+    assert len(entered) == 2
@@ -0,0 +1,76 @@
+"""
+Tests for the optimization result cache.
+"""
+import pytest
+
+from backend.services.optimization import PlaylistOptimizationService
+
+
+@pytest.fixture
+def service():
+    return PlaylistOptimizationService()
+
+
+def make_result(playlist_id="p1"):
+    return {
+        "playlist_id": playlist_id,
+        "recommendations": [{"title": "Smooth transitions", "priority": "high"}],
+        "summary": {"total_recommendations": 1},
+        "playlist_metrics": {"average_energy": 0.5},
+    }
+
+
+def test_cached_result_is_returned_until_it_expires(service):
+    key = ("user", "p1", "snap", ("flow",))
+    service._cache_result(key, make_result())
+
+    assert service._get_cached_result(key) == make_result()
+
+
+def test_expired_result_is_dropped(service):
+    service.RESULT_CACHE_TTL = 0
+    key = ("user", "p1", "snap", ("flow",))
+    service._cache_result(key, make_result())
+
+    assert service._get_cached_result(key) is None
+    assert key not in service._result_cache
+
+
+def test_missing_key_is_a_miss(service):
+    assert service._get_cached_result(("user", "p1", "snap", ("flow",))) is None
+
+
+def test_oldest_entry_is_evicted_when_full(service):
+    service.RESULT_CACHE_MAX_ENTRIES = 2
+    keys = [("user", f"p{i}", "snap", ("flow",)) for i in range(3)]
+    for key in keys:
+        service._cache_result(key, make_result(key[1]))
+
+    assert service._get_cached_result(keys[0]) is None
+    assert service._get_cached_result(keys[1])["playlist_id"] == "p1"
+    assert service._get_cached_result(keys[2])["playlist_id"] == "p2"
+
+
+def test_restoring_a_key_makes_it_newest(service):
+    service.RESULT_CACHE_MAX_ENTRIES = 2
+    first, second, third = [("user", f"p{i}", "snap", ("flow",)) for i in range(3)]
+    service._cache_result(first, make_result("p0"))
+    service._cache_result(second, make_result("p1"))
+    service._cache_result(first, make_result("p0"))
+    service._cache_result(third, make_result("p2"))
+
+    assert service._get_cached_result(second) is None
+    assert service._get_cached_result(first)["playlist_id"] == "p0"
+
+
+def test_callers_cannot_corrupt_cached_results(service):
+    key = ("user", "p1", "snap", ("flow",))
+    stored = make_result()
+    service._cache_result(key, stored)
+    stored["recommendations"].clear()
+
+    hit = service._get_cached_result(key)
+    hit["recommendations"].append({"title": "Injected", "priority": "low"})
+    hit["playlist_metrics"]["average_energy"] = 1.0
+
+    assert service._get_cached_result(key) == make_result()
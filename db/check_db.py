@@ -3,12 +3,34 @@
 Standalone database verification script for the Spotify Playlist Optimizer.
 This script is completely self-contained and doesn't rely on any project imports.
 """
+import argparse
 import sqlite3
 import os
 
-def check_database():
+def _approximate_row_counts(cursor):
+    """
+    Read approximate row counts from sqlite_stat1, if ANALYZE has been run.
+    
+    The first number of each stat entry is the row count of the table (or
+    of the index, which covers every row), so no table needs to be scanned.
+    """
+    cursor.execute("SELECT 1 FROM sqlite_master WHERE type='table' AND name='sqlite_stat1';")
+    if cursor.fetchone() is None:
+        return {}
+    
+    counts = {}
+    cursor.execute("SELECT tbl, stat FROM sqlite_stat1;")
+    for table_name, stat in cursor.fetchall():
+        if stat:
+            counts[table_name] = max(counts.get(table_name, 0), int(stat.split()[0]))
+    return counts
+
+def check_database(exact=False):
     """
     Check if the SQLite database exists and inspect its schema.
+    
+    Row counts come from sqlite_stat1 when available; tables without
+    statistics (or every table, with exact=True) are counted directly.
     """
     db_path = "db/spotify.db"
     
@@ -33,21 +55,34 @@ def check_database():
             print("The database file exists but contains no tables.")
             print("Please run 'python backend/create_db.py' to create the schema.")
         else:
+            # Get column info for every table in one query
+            cursor.execute(
+                "SELECT m.name, p.name FROM sqlite_master AS m "
+                "JOIN pragma_table_info(m.name) AS p "
+                "WHERE m.type='table' ORDER BY m.name, p.cid;"
+            )
+            columns_by_table = {}
+            for table_name, column_name in cursor.fetchall():
+                columns_by_table.setdefault(table_name, []).append(column_name)
+            
+            approximate_counts = {} if exact else _approximate_row_counts(cursor)
+            
             print(f"\n[SUCCESS] Found {len(tables)} table(s):")
             for table in tables:
                 table_name = table[0]
                 print(f"- {table_name}")
                 
-                # Get column info for each table
-                cursor.execute(f"PRAGMA table_info({table_name});")
-                columns = cursor.fetchall()
+                columns = columns_by_table.get(table_name)
                 if columns:
-                    print(f"  Columns: {', '.join([col[1] for col in columns])}")
+                    print(f"  Columns: {', '.join(columns)}")
                 
                 # Get row count
-                cursor.execute(f"SELECT COUNT(*) FROM {table_name};")
-                count = cursor.fetchone()[0]
-                print(f"  Rows: {count}")
+                if table_name in approximate_counts:
+                    print(f"  Rows: ~{approximate_counts[table_name]} (from sqlite_stat1)")
+                else:
+                    cursor.execute(f"SELECT COUNT(*) FROM {table_name};")
+                    count = cursor.fetchone()[0]
+                    print(f"  Rows: {count}")
                 print()
         
         conn.close()
@@ -56,4 +91,7 @@ def check_database():
         print(f"\n[ERROR] Failed to inspect database: {e}")
 
 if __name__ == "__main__":
-    check_database()
+    parser = argparse.ArgumentParser(description="Inspect the Spotify Playlist Optimizer SQLite database.")
+    parser.add_argument("--exact", action="store_true", help="count rows with SELECT COUNT(*) instead of using sqlite_stat1")
+    args = parser.parse_args()
+    check_database(exact=args.exact)
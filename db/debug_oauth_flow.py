@@ -4,11 +4,18 @@ Test script to help debug the OAuth callback step by step.
 
 # NOTE: This script has been moved to db/ as part of the new project structure.
 """
+import sys
 import webbrowser
 import time
 
-def debug_oauth_flow():
-    """Guide through OAuth debugging step by step."""
+def debug_oauth_flow(interactive=True):
+    """Guide through OAuth debugging step by step.
+
+    Args:
+        interactive: Wait for Enter and open the browser. When False the
+            guide and authorization URL are only printed, so CI or piped
+            runs never block.
+    """
     print("🔍 OAUTH CALLBACK DEBUGGING GUIDE")
     print("=" * 50)
     print()
@@ -58,11 +65,15 @@ def debug_oauth_flow():
     print("   If you only see homepage, the issue is in Spotify authorization")
     print()
     
+    auth_url = "https://accounts.spotify.com/authorize?client_id=da2391ba0fd8492eb4547b2e27680d16&response_type=code&redirect_uri=http%3A%2F%2F127.0.0.1%3A3000%2Fcallback&scope=user-read-private+playlist-read-private+playlist-modify-public+playlist-modify-private+user-library-read+user-library-modify+user-read-playback-state+user-read-recently-played+user-top-read+user-read-email+user-read-playback-position&state=random_state_string"
+    
+    if not interactive:
+        print("Non-interactive mode: open the URL above manually.")
+        return
+    
     input("Press Enter when you're ready to test...")
     
     print("Opening authorization URL in your default browser...")
-    auth_url = "https://accounts.spotify.com/authorize?client_id=da2391ba0fd8492eb4547b2e27680d16&response_type=code&redirect_uri=http%3A%2F%2F127.0.0.1%3A3000%2Fcallback&scope=user-read-private+playlist-read-private+playlist-modify-public+playlist-modify-private+user-library-read+user-library-modify+user-read-playback-state+user-read-recently-played+user-top-read+user-read-email+user-read-playback-position&state=random_state_string"
-    
     webbrowser.open(auth_url)
     
     print()
@@ -73,4 +84,6 @@ def debug_oauth_flow():
     print("4. Report back what you see!")
 
 if __name__ == "__main__":
-    debug_oauth_flow()
+    debug_oauth_flow(
+        interactive=sys.stdin.isatty() and "--non-interactive" not in sys.argv
+    )
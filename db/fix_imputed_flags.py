@@ -29,26 +29,28 @@ def fix_imputed_flags():
     default_values = AudioFeaturesService.FEATURE_DEFAULTS
     
     # Look for tracks with the exact pattern of default values
-    tracks_with_defaults = db.query(Track).filter(
+    defaults_filter = (
         Track.danceability == default_values["danceability"],
         Track.energy == default_values["energy"],
         Track.tempo == default_values["tempo"],
         Track.features_imputed == False  # Incorrectly marked as real
-    ).all()
+    )
+    sample_tracks = db.query(Track.name, Track.danceability).filter(*defaults_filter).limit(5).all()
     
-    print(f"🔍 Found {len(tracks_with_defaults)} tracks with default values incorrectly marked as real")
+    # Flip the flags in a single UPDATE ... WHERE, without loading the rows
+    updated_count = db.query(Track).filter(*defaults_filter).update(
+        {Track.features_imputed: True}, synchronize_session=False
+    ) if sample_tracks else 0
     
-    if tracks_with_defaults:
+    print(f"🔍 Found {updated_count} tracks with default values incorrectly marked as real")
+    
+    if updated_count:
         print("Sample tracks to be fixed:")
-        for track in tracks_with_defaults[:5]:
+        for track in sample_tracks:
             print(f"  - {track.name[:40]:<40} | danceability: {track.danceability}")
         
-        # Update the flags
-        for track in tracks_with_defaults:
-            track.features_imputed = True
-        
         db.commit()
-        print(f"✅ Updated {len(tracks_with_defaults)} tracks to features_imputed=True")
+        print(f"✅ Updated {updated_count} tracks to features_imputed=True")
     
     # Show summary
     total_tracks = db.query(Track).count()
@@ -9,6 +9,8 @@ from pathlib import Path
 project_root = Path(__file__).resolve().parent
 sys.path.insert(0, str(project_root))
 
+from sqlalchemy import text
+
 from backend.models import Base
 from backend.dependencies import engine, DB_PATH
 
@@ -24,6 +26,16 @@ def init_database():
         Base.metadata.create_all(bind=engine)
         print("✅ Database tables created successfully")
         
+        # The engine's connect hook applies the WAL/sync PRAGMAs; report them
+        # and fold the DDL back into the main file so the first writer starts
+        # with an empty WAL.
+        with engine.connect() as conn:
+            journal_mode = conn.execute(text("PRAGMA journal_mode")).scalar()
+            synchronous = conn.execute(text("PRAGMA synchronous")).scalar()
+            if journal_mode == "wal":
+                conn.execute(text("PRAGMA wal_checkpoint(TRUNCATE)"))
+        print(f"✅ journal_mode={journal_mode}, synchronous={synchronous}")
+        
         # Verify tables were created
         import sqlite3
         conn = sqlite3.connect(str(DB_PATH))
@@ -5,10 +5,18 @@ This script will monitor the callback process in real-time.
 
 # NOTE: This script has been moved to db/ as part of the new project structure.
 """
+import sys
 import time
 import requests
 import sqlite3
 from datetime import datetime
+from pathlib import Path
+
+# Add the project root to the Python path
+project_root = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(project_root))
+
+from backend.dependencies import DB_PATH
 
 def monitor_oauth_flow():
     """Monitor the OAuth flow completion in real-time."""
@@ -28,29 +36,37 @@ def monitor_oauth_flow():
     print("Press Ctrl+C to stop monitoring")
     print()
     
-    last_user_count = 0
-    monitoring_start = datetime.now()
+    last_user_id = 0
+    last_version = None
+    monitoring_start = time.monotonic()
+    next_status = monitoring_start  # first status line on the first tick
+    
+    # One read-only connection for the whole session; PRAGMA data_version only
+    # changes when another connection commits, so the users query runs only then.
+    # It is opened in the poll loop so the monitor can start before the database exists.
+    conn = None
     
     try:
         while True:
             # Check database for new users
             try:
-                conn = sqlite3.connect('spotify.db')
-                cursor = conn.cursor()
-                cursor.execute('SELECT COUNT(*) FROM users')
-                current_user_count = cursor.fetchone()[0]
+                if conn is None:
+                    conn = sqlite3.connect(f"{DB_PATH.as_uri()}?mode=ro", uri=True, isolation_level=None)
+                    cursor = conn.cursor()
                 
-                if current_user_count != last_user_count:
-                    timestamp = datetime.now().strftime("%H:%M:%S")
-                    print(f"[{timestamp}] 🎉 USER COUNT CHANGED: {last_user_count} → {current_user_count}")
+                version = cursor.execute('PRAGMA data_version').fetchone()[0]
+                
+                if version != last_version:
+                    last_version = version
+                    cursor.execute('SELECT id, spotify_user_id, display_name, email, created_at FROM users ORDER BY id DESC LIMIT 1')
+                    user = cursor.fetchone()
                     
-                    if current_user_count > 0:
-                        # Get user details
-                        cursor.execute('SELECT spotify_user_id, display_name, email, created_at FROM users ORDER BY id DESC LIMIT 1')
-                        user = cursor.fetchone()
-                        print(f"           New user: {user[1]} ({user[0]})")
-                        print(f"           Email: {user[2]}")
-                        print(f"           Created: {user[3]}")
+                    if user is not None and user[0] != last_user_id:
+                        timestamp = datetime.now().strftime("%H:%M:%S")
+                        print(f"[{timestamp}] 🎉 NEW USER DETECTED: id {last_user_id} → {user[0]}")
+                        print(f"           New user: {user[2]} ({user[1]})")
+                        print(f"           Email: {user[3]}")
+                        print(f"           Created: {user[4]}")
                         print()
                         print("✅ SUCCESS! User created successfully!")
                         print("Now testing analytics endpoints...")
@@ -67,25 +83,26 @@ def monitor_oauth_flow():
                             print(f"Analytics test error: {e}")
                         
                         break
-                    
-                    last_user_count = current_user_count
-                
-                conn.close()
                 
                 # Show periodic status
-                if int(time.time()) % 10 == 0:  # Every 10 seconds
-                    elapsed = datetime.now() - monitoring_start
+                now = time.monotonic()
+                if now >= next_status:  # Every 10 seconds
+                    next_status = now + 10.0
                     timestamp = datetime.now().strftime("%H:%M:%S")
-                    print(f"[{timestamp}] Monitoring... ({int(elapsed.total_seconds())}s elapsed, {current_user_count} users)")
+                    print(f"[{timestamp}] Monitoring... ({int(now - monitoring_start)}s elapsed)")
                 
             except Exception as e:
                 print(f"Database check error: {e}")
+                time.sleep(1.0)  # back off while the database is unavailable
             
-            time.sleep(1)  # Check every second
+            time.sleep(0.05)  # data_version is a cheap header read
             
     except KeyboardInterrupt:
         print("\n\nMonitoring stopped.")
         print("If no users were created, check browser console for JavaScript errors.")
+    finally:
+        if conn is not None:
+            conn.close()
 
 if __name__ == "__main__":
     monitor_oauth_flow()
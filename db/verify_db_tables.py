@@ -9,12 +9,19 @@ from pathlib import Path
 db_path = Path("db/spotify.db")
 print(f"Checking database at: {db_path.absolute()}")
 
-if not db_path.exists():
+try:
+    db_size = db_path.stat().st_size
+except FileNotFoundError:
     print("❌ Database file does not exist!")
     exit(1)
 
+if db_size < 100:  # smaller than the SQLite file header: no schema yet
+    print("❌ Database file is empty!")
+    exit(1)
+
 try:
-    conn = sqlite3.connect(str(db_path))
+    # Read-only so verifying can never create or modify the database
+    conn = sqlite3.connect(f"{db_path.absolute().as_uri()}?mode=ro", uri=True)
     cursor = conn.cursor()
     
     # Get all tables
@@ -22,21 +29,22 @@ try:
     tables = cursor.fetchall()
     
     print(f"\n✅ Database found with {len(tables)} tables:")
-    for table in tables:
-        table_name = table[0]
-        cursor.execute(f"SELECT COUNT(*) FROM {table_name}")
-        count = cursor.fetchone()[0]
-        print(f"  - {table_name}: {count} records")
+    counts = {}
+    if tables:
+        # One compound statement instead of a COUNT(*) round trip per table;
+        # names come from sqlite_master, quotes are doubled for identifiers.
+        cursor.execute(" UNION ALL ".join(
+            "SELECT ?, COUNT(*) FROM \"{}\"".format(name.replace('"', '""'))
+            for (name,) in tables
+        ), [name for (name,) in tables])
+        counts = dict(cursor.fetchall())
+    for (table_name,) in tables:
+        print(f"  - {table_name}: {counts[table_name]} records")
     
     # Check if users table exists
-    cursor.execute("SELECT name FROM sqlite_master WHERE type='table' AND name='users'")
-    users_table = cursor.fetchone()
-    
-    if users_table:
+    if "users" in counts:
         print("\n✅ Users table exists")
-        cursor.execute("SELECT COUNT(*) FROM users")
-        user_count = cursor.fetchone()[0]
-        print(f"   Users count: {user_count}")
+        print(f"   Users count: {counts['users']}")
     else:
         print("\n❌ Users table does NOT exist")
     
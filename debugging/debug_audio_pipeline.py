@@ -3,9 +3,13 @@
 Debug script to test the complete audio features pipeline with real database tracks.
 """
 import asyncio
+import logging
+import operator
 import sys
 from pathlib import Path
 
+import numpy as np
+
 # Add project root to path
 project_root = Path(__file__).parent
 sys.path.insert(0, str(project_root))
@@ -13,6 +17,16 @@ sys.path.insert(0, str(project_root))
 from backend.dependencies import SessionLocal
 from backend.models import Track
 from backend.services.audio_features import AudioFeaturesService
+from backend.services.reccobeats import close_shared_client
+
+logger = logging.getLogger(__name__)
+
+
+def _missing_mask(tracks, features):
+    """Boolean (tracks x features) array that is True where a value is None."""
+    getter = operator.attrgetter(*features)
+    values = np.array([getter(track) for track in tracks], dtype=np.float64)
+    return np.isnan(values.reshape(len(tracks), len(features)))
 
 
 async def debug_audio_features_pipeline():
@@ -34,17 +48,18 @@ async def debug_audio_features_pipeline():
         
         # Show initial state
         service = AudioFeaturesService()
+        features = service.AUDIO_FEATURES
+        initial_mask = _missing_mask(tracks, features)
         for i, track in enumerate(tracks):
             print(f"\nTrack {i+1}: {track.name[:30]}...")
             print(f"  Spotify ID: {track.spotify_track_id}")
             
             missing_features = []
-            for feature in service.AUDIO_FEATURES:
-                value = getattr(track, feature)
-                if value is None:
+            for feature, missing in zip(features, initial_mask[i]):
+                if missing:
                     missing_features.append(feature)
                 else:
-                    print(f"  {feature}: {value}")
+                    print(f"  {feature}: {getattr(track, feature)}")
             
             if missing_features:
                 print(f"  Missing: {', '.join(missing_features)}")
@@ -53,26 +68,18 @@ async def debug_audio_features_pipeline():
         print(f"\n🔄 Testing audio features fetching...")
         
         # Count initial missing features
-        initial_missing = 0
-        for track in tracks:
-            for feature in service.AUDIO_FEATURES:
-                if getattr(track, feature) is None:
-                    initial_missing += 1
+        initial_missing = int(initial_mask.sum())
         
         print(f"Initial missing features: {initial_missing}")
         
-        # Call the fetch method
-        updated_tracks = await service.fetch_missing_audio_features(tracks, db)
+        # Fetch from ReccoBeats and impute whatever is still missing
+        updated_tracks = await service.fetch_and_impute_features(tracks, db)
         
         # Count final missing features
-        final_missing = 0
-        for track in tracks:
-            for feature in service.AUDIO_FEATURES:
-                if getattr(track, feature) is None:
-                    final_missing += 1
+        final_missing = int(_missing_mask(tracks, features).sum())
         
         print(f"Final missing features: {final_missing}")
-        print(f"Features fetched: {initial_missing - final_missing}")
+        print(f"Features filled (fetched or imputed): {initial_missing - final_missing}")
         
         # Show final state
         print(f"\n📊 Final track states:")
@@ -104,14 +111,7 @@ async def debug_audio_features_pipeline():
         print(f"Prepared {len(prepared_tracks)} tracks for clustering")
         
         # Check if all features are now populated
-        all_populated = True
-        for track in prepared_tracks:
-            for feature in service.AUDIO_FEATURES:
-                if getattr(track, feature) is None:
-                    all_populated = False
-                    break
-            if not all_populated:
-                break
+        all_populated = not _missing_mask(prepared_tracks, features).any()
         
         if all_populated:
             print("✅ All tracks now have complete audio features!")
@@ -119,13 +119,20 @@ async def debug_audio_features_pipeline():
             print("❌ Some tracks still have missing features after preparation")
         
     except Exception as e:
-        print(f"❌ Error during debugging: {e}")
-        import traceback
-        traceback.print_exc()
+        logger.exception("❌ Error during debugging: %s", e)
     
     finally:
         db.close()
 
 
+async def main():
+    """Run the debug session, then close the shared ReccoBeats HTTP client."""
+    try:
+        await debug_audio_features_pipeline()
+    finally:
+        await close_shared_client()
+
+
 if __name__ == "__main__":
-    asyncio.run(debug_audio_features_pipeline())
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(message)s")
+    asyncio.run(main())
@@ -4,29 +4,35 @@ Debug script to analyze ReccoBeats coverage for real playlist data
 and test the features_imputed flag logic.
 """
 import asyncio
+import operator
 import sys
 from pathlib import Path
 
+import numpy as np
+from sqlalchemy import select
+
 # Add project root to path for imports
 project_root = Path(__file__).parent.absolute()
 sys.path.insert(0, str(project_root))
 
-from backend.services.reccobeats import ReccoBeatsService
+from backend.services.reccobeats import ReccoBeatsService, close_shared_client
 from backend.services.audio_features import AudioFeaturesService
+from backend.dependencies import SessionLocal
 from backend.models import Track
-from sqlalchemy import create_engine
-from sqlalchemy.orm import sessionmaker
 
 async def analyze_playlist_coverage():
     """Analyze ReccoBeats coverage for tracks in database."""
     
-    # Connect to database
-    engine = create_engine("sqlite:///db/spotify.db")
-    Session = sessionmaker(bind=engine)
-    db = Session()
+    # Connect to database through the app's shared, PRAGMA-configured engine
+    db = SessionLocal()
     
-    # Get sample tracks from database
-    tracks = db.query(Track).limit(20).all()  # Test with first 20 tracks
+    # Get sample tracks from database as plain rows; full ORM objects are only
+    # loaded below for the tracks that will actually be updated.
+    feature_columns = [getattr(Track, f) for f in AudioFeaturesService.AUDIO_FEATURES]
+    tracks = db.execute(
+        select(Track.id, Track.spotify_track_id, Track.name, Track.features_imputed, *feature_columns)
+        .limit(20)  # Test with first 20 tracks
+    ).all()
     
     if not tracks:
         print("❌ No tracks found in database. Run /tracks endpoint first.")
@@ -62,10 +68,15 @@ async def analyze_playlist_coverage():
     audio_service = AudioFeaturesService(service)
     
     # Test with tracks that need features
-    tracks_needing_features = [
-        track for track in tracks 
-        if track.features_imputed or any(getattr(track, f) is None for f in audio_service.AUDIO_FEATURES)
-    ]
+    getter = operator.attrgetter(*audio_service.AUDIO_FEATURES)
+    values = np.array([getter(track) for track in tracks], dtype=np.float64)
+    needs_features = np.isnan(values).any(axis=1)
+    needs_features |= np.fromiter((bool(track.features_imputed) for track in tracks), dtype=bool, count=len(tracks))
+    needing_ids = [track.id for track, needs in zip(tracks, needs_features) if needs]
+    tracks_needing_features = (
+        db.query(Track).filter(Track.id.in_(needing_ids)).all() if needing_ids else []
+    )
+    complete_tracks = [track for track, needs in zip(tracks, needs_features) if not needs]
     
     print(f"Tracks needing features: {len(tracks_needing_features)}")
     
@@ -85,7 +96,8 @@ async def analyze_playlist_coverage():
     print("DATA QUALITY ANALYSIS")
     print("="*60)
     
-    quality_report = audio_service.analyze_data_quality(tracks)
+    # Rows that needed no update are still current; the rest were refreshed in place
+    quality_report = audio_service.analyze_data_quality(tracks_needing_features + complete_tracks)
     print(f"Overall completeness: {quality_report['overall_completeness']:.2%}")
     print(f"Recommendation: {quality_report['recommendation']}")
     
@@ -96,5 +108,12 @@ async def analyze_playlist_coverage():
     
     db.close()
 
+async def main():
+    """Run the debug session, then close the shared ReccoBeats HTTP client."""
+    try:
+        await analyze_playlist_coverage()
+    finally:
+        await close_shared_client()
+
 if __name__ == "__main__":
-    asyncio.run(analyze_playlist_coverage())
+    asyncio.run(main())
@@ -6,33 +6,39 @@ import asyncio
 import sys
 from pathlib import Path
 
+from sqlalchemy import select
+
 # Add project root to path for imports
 project_root = Path(__file__).parent.absolute()
 sys.path.insert(0, str(project_root))
 
-from backend.services.reccobeats import ReccoBeatsService
+from backend.services.reccobeats import ReccoBeatsService, close_shared_client
+from backend.services.audio_features import AudioFeaturesService
+from backend.dependencies import SessionLocal
 from backend.models import Track
-from sqlalchemy import create_engine
-from sqlalchemy.orm import sessionmaker
 
 async def debug_feature_mapping():
     """Debug why ReccoBeats features aren't being mapped to tracks."""
     
-    # Connect to database
-    engine = create_engine("sqlite:///db/spotify.db")
-    Session = sessionmaker(bind=engine)
-    db = Session()
+    # Connect to database through the app's shared, PRAGMA-configured engine
+    db = SessionLocal()
     
-    # Get a few tracks
-    tracks = db.query(Track).limit(5).all()
+    # Get a few tracks; read-only, so project just the columns used below
+    feature_columns = [getattr(Track, f) for f in AudioFeaturesService.AUDIO_FEATURES]
+    tracks = db.execute(
+        select(Track.spotify_track_id, Track.name, *feature_columns).limit(5)
+    ).all()
     
     print("🔍 Debugging feature mapping")
     print("="*50)
     
-    for track in tracks:
+    # Strip URI prefixes once; reused for both the printout and the track map
+    cleaned_ids = [(track.spotify_track_id or "").rpartition(":")[2] for track in tracks]
+    
+    for track, cleaned_id in zip(tracks, cleaned_ids):
         print(f"\nTrack: {track.name[:30]}")
         print(f"  spotify_track_id: {track.spotify_track_id}")
-        print(f"  cleaned ID: {track.spotify_track_id.split(':')[-1] if track.spotify_track_id else 'None'}")
+        print(f"  cleaned ID: {cleaned_id or 'None'}")
         print(f"  current danceability: {track.danceability}")
     
     track_ids = [track.spotify_track_id for track in tracks if track.spotify_track_id]
@@ -47,7 +53,7 @@ async def debug_feature_mapping():
     
     # Test the mapping logic from AudioFeaturesService
     print(f"\n🔗 Testing mapping logic:")
-    track_map = {(t.spotify_track_id or "").split(":")[-1]: t for t in tracks}
+    track_map = dict(zip(cleaned_ids, tracks))
     print(f"Track map keys: {list(track_map.keys())}")
     print(f"Features map keys: {list(features_map.keys())}")
     
@@ -77,5 +83,12 @@ async def debug_feature_mapping():
     
     db.close()
 
+async def main():
+    """Run the debug session, then close the shared ReccoBeats HTTP client."""
+    try:
+        await debug_feature_mapping()
+    finally:
+        await close_shared_client()
+
 if __name__ == "__main__":
-    asyncio.run(debug_feature_mapping())
+    asyncio.run(main())
@@ -11,7 +11,7 @@ from pathlib import Path
 project_root = Path(__file__).parent.absolute()
 sys.path.insert(0, str(project_root))
 
-from backend.services.reccobeats import ReccoBeatsService
+from backend.services.reccobeats import ReccoBeatsService, close_shared_client
 
 async def test_reccobeats_bulk_fetch():
     """Test ReccoBeats bulk fetch with sample Spotify track IDs."""
@@ -57,14 +57,19 @@ async def test_reccobeats_bulk_fetch():
     print("STEP 3: Testing individual lookups for comparison")
     print("="*50)
     
-    for track_id in test_track_ids[:2]:  # Test first 2 only
+    # Issue the lookups concurrently; results are printed in input order
+    sample_ids = test_track_ids[:2]  # Test first 2 only
+    uuids = await asyncio.gather(*(service._get_reccobeats_uuid(tid) for tid in sample_ids))
+    found_ids = [tid for tid, uuid in zip(sample_ids, uuids) if uuid]
+    individual_results = await asyncio.gather(*(service.get_track_audio_features(tid) for tid in found_ids))
+    individual_by_id = dict(zip(found_ids, individual_results))
+    
+    for track_id, uuid in zip(sample_ids, uuids):
         print(f"\nTesting individual lookup for: {track_id}")
-        uuid = await service._get_reccobeats_uuid(track_id)
         print(f"UUID: {uuid}")
         
         if uuid:
-            individual_features = await service.get_track_audio_features(track_id)
-            print(f"Individual features: {individual_features}")
+            print(f"Individual features: {individual_by_id[track_id]}")
     
     print("\n" + "="*50)
     print("SUMMARY")
@@ -72,5 +77,12 @@ async def test_reccobeats_bulk_fetch():
     print(f"Bulk UUID lookup: {len(uuid_map)}/{len(test_track_ids)} found")
     print(f"Bulk features fetch: {len(features_result)}/{len(test_track_ids)} found")
 
+async def main():
+    """Run the debug session, then close the shared ReccoBeats HTTP client."""
+    try:
+        await test_reccobeats_bulk_fetch()
+    finally:
+        await close_shared_client()
+
 if __name__ == "__main__":
-    asyncio.run(test_reccobeats_bulk_fetch())
+    asyncio.run(main())
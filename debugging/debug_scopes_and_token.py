@@ -5,21 +5,89 @@ Test script to verify current token scopes and test minimal audio features reque
 
 import asyncio
 import httpx
+import logging
+import orjson
 import sys
 from pathlib import Path
 
+from sqlalchemy import select
+
 # Add backend to path
 sys.path.append(str(Path(__file__).parent / "backend"))
 
 from backend.dependencies import get_database
 from backend.models import User
+from backend.services.http_retry import get_with_retry
+
+SPOTIFY_API_URL = "https://api.spotify.com/v1"
+
+MAX_REQUESTS_PER_SECOND = 10
+MAX_RETRIES = 4
+RETRY_BACKOFF_BASE = 0.5
+RETRY_BACKOFF_MAX = 8.0  # below http_retry.MAX_RETRY_AFTER, the longest honoured Retry-After
+RETRYABLE_STATUS_CODES = {429, 500, 502, 503, 504}
+
+
+class _RequestPacer:
+    """Leaky bucket that spaces request starts at least 1/rate seconds apart."""
+    
+    def __init__(self, rate: float):
+        self._interval = 1.0 / rate
+        self._next_slot = 0.0
+    
+    async def __aenter__(self) -> None:
+        """Sleep until this caller's slot; slots are claimed in call order."""
+        now = asyncio.get_running_loop().time()
+        slot = max(now, self._next_slot)
+        self._next_slot = slot + self._interval
+        if slot > now:
+            await asyncio.sleep(slot - now)
+    
+    async def __aexit__(self, *exc_info) -> None:
+        return None
+
+
+_pacer = _RequestPacer(MAX_REQUESTS_PER_SECOND)
+
+
+async def spotify_get(client: httpx.AsyncClient, url: str, **kwargs) -> httpx.Response:
+    """
+    GET a Spotify endpoint under the shared rate limit, retrying transient failures.
+    
+    Args:
+        client: Client to send the request with
+        url: Endpoint URL
+        **kwargs: Passed through to httpx.AsyncClient.get
+        
+    Returns:
+        httpx.Response: The final response
+    """
+    return await get_with_retry(
+        client,
+        url,
+        max_retries=MAX_RETRIES,
+        retryable_status_codes=RETRYABLE_STATUS_CODES,
+        backoff_base=RETRY_BACKOFF_BASE,
+        backoff_max=RETRY_BACKOFF_MAX,
+        limiter=_pacer,
+        **kwargs
+    )
+
+
+def _unwrap(result):
+    """Return a response from asyncio.gather, re-raising a captured exception."""
+    if isinstance(result, BaseException):
+        raise result
+    return result
+
 
 async def test_token_and_scopes():
     """Test current token scopes and minimal audio features access."""
     
     # Get a user from database
     db = next(get_database())
-    user = db.query(User).first()
+    user = db.execute(select(User.spotify_user_id, User.access_token).limit(1)).first()
+    db.close()  # only this one row is needed
     
     if not user or not user.access_token:
         print("❌ No user with access token found in database")
@@ -29,16 +97,31 @@ async def test_token_and_scopes():
     print(f"✅ Testing with user: {user.spotify_user_id}")
     print(f"✅ Token ending in: ...{token[-4:]}")
     
-    async with httpx.AsyncClient() as client:
-        headers = {"Authorization": f"Bearer {token}"}
+    single_track_id = "11dFghVXANMlKmJXsNCbNl"  # Example from Spotify docs
+    
+    async with httpx.AsyncClient(
+        headers={"Authorization": f"Bearer {token}"},
+        http2=True,
+        limits=httpx.Limits(max_keepalive_connections=10, max_connections=10),
+        timeout=10.0,
+    ) as client:
+        # The probes are independent, so issue them together over one
+        # connection pool and report the results in order below.
+        profile_result, single_result, bulk_result, playlists_result = await asyncio.gather(
+            spotify_get(client, f"{SPOTIFY_API_URL}/me"),
+            spotify_get(client, f"{SPOTIFY_API_URL}/audio-features/{single_track_id}"),
+            spotify_get(client, f"{SPOTIFY_API_URL}/audio-features", params={"ids": single_track_id}),
+            spotify_get(client, f"{SPOTIFY_API_URL}/me/playlists", params={"limit": 1}),
+            return_exceptions=True,
+        )
         
         # 1. Test basic profile access (should work with our scopes)
         print(f"\n🔍 Test 1: Basic profile access")
         try:
-            response = await client.get("https://api.spotify.com/v1/me", headers=headers)
+            response = _unwrap(profile_result)
             print(f"Status: {response.status_code}")
             if response.status_code == 200:
-                data = response.json()
+                data = orjson.loads(response.content)
                 print(f"✅ Profile access works - User: {data.get('display_name')}")
             else:
                 print(f"❌ Profile access failed: {response.text}")
@@ -47,19 +130,15 @@ async def test_token_and_scopes():
         
         # 2. Test minimal single audio features request  
         print(f"\n🔍 Test 2: Single audio features (minimal)")
-        single_track_id = "11dFghVXANMlKmJXsNCbNl"  # Example from Spotify docs
         try:
-            response = await client.get(
-                f"https://api.spotify.com/v1/audio-features/{single_track_id}",
-                headers=headers
-            )
+            response = _unwrap(single_result)
             print(f"Status: {response.status_code}")
             if response.status_code == 200:
-                data = response.json()
+                data = orjson.loads(response.content)
                 print(f"✅ Single audio features works - Track: {data.get('id')}")
                 print(f"   Danceability: {data.get('danceability')}")
             else:
-                error_data = response.json() if response.content else {}
+                error_data = orjson.loads(response.content) if response.content else {}
                 print(f"❌ Single audio features failed: {error_data}")
         except Exception as e:
             print(f"❌ Single audio features request failed: {e}")
@@ -67,20 +146,16 @@ async def test_token_and_scopes():
         # 3. Test bulk audio features request (our current approach)
         print(f"\n🔍 Test 3: Bulk audio features (our approach)")
         try:
-            response = await client.get(
-                "https://api.spotify.com/v1/audio-features",
-                headers=headers,
-                params={"ids": single_track_id}
-            )
+            response = _unwrap(bulk_result)
             print(f"Status: {response.status_code}")
             if response.status_code == 200:
-                data = response.json()
+                data = orjson.loads(response.content)
                 features = data.get('audio_features', [])
                 print(f"✅ Bulk audio features works - {len(features)} features returned")
                 if features and features[0]:
                     print(f"   First track danceability: {features[0].get('danceability')}")
             else:
-                error_data = response.json() if response.content else {}
+                error_data = orjson.loads(response.content) if response.content else {}
                 print(f"❌ Bulk audio features failed: {error_data}")
                 
                 # Detailed error analysis
@@ -100,14 +175,10 @@ async def test_token_and_scopes():
         # 4. Test if we can access user's playlists (scope verification)
         print(f"\n🔍 Test 4: Playlists access (scope verification)")
         try:
-            response = await client.get(
-                "https://api.spotify.com/v1/me/playlists",
-                headers=headers,
-                params={"limit": 1}
-            )
+            response = _unwrap(playlists_result)
             print(f"Status: {response.status_code}")
             if response.status_code == 200:
-                data = response.json()
+                data = orjson.loads(response.content)
                 playlists = data.get('items', [])
                 print(f"✅ Playlists access works - {len(playlists)} playlists")
                 if playlists:
@@ -116,8 +187,12 @@ async def test_token_and_scopes():
                 print(f"❌ Playlists access failed: {response.text}")
         except Exception as e:
             print(f"❌ Playlists request failed: {e}")
-    
-    db.close()
 
-if __name__ == "__main__":
+def main():
+    """Run the probes, showing retry notices from the shared HTTP helper."""
+    logging.basicConfig(level=logging.WARNING, format="%(levelname)s %(name)s: %(message)s")
     asyncio.run(test_token_and_scopes())
+
+
+if __name__ == "__main__":
+    main()
@@ -8,6 +8,8 @@ import asyncio
 import sys
 from pathlib import Path
 
+from sqlalchemy import func
+
 # Add backend to path
 sys.path.append(str(Path(__file__).parent / "backend"))
 
@@ -31,26 +33,31 @@ def check_existing_data():
     # Check playlists
     playlists = db.query(Playlist).all()
     print(f"\n📁 Playlists: {len(playlists)}")
+    track_counts = dict(
+        db.query(Track.playlist_id, func.count(Track.id)).group_by(Track.playlist_id).all()
+    )
     for playlist in playlists:
-        track_count = db.query(Track).filter(Track.playlist_id == playlist.id).count()
-        print(f"   - {playlist.name} ({track_count} tracks)")
+        print(f"   - {playlist.name} ({track_counts.get(playlist.id, 0)} tracks)")
     
     # Check tracks and their audio features
-    all_tracks = db.query(Track).all()
-    print(f"\n🎵 Total Tracks: {len(all_tracks)}")
+    # Aggregate in SQL; only a single sample row is ever loaded
+    total_tracks = db.query(func.count(Track.id)).scalar()
+    features_available = 0
+    print(f"\n🎵 Total Tracks: {total_tracks}")
     
-    if all_tracks:
+    if total_tracks:
         # Analyze audio features availability
-        features_available = 0
-        for track in all_tracks:
-            if track.danceability is not None:  # Check if any audio features exist
-                features_available += 1
+        features_available = (
+            db.query(func.count(Track.id))
+            .filter(Track.danceability.isnot(None))  # Check if any audio features exist
+            .scalar()
+        )
         
-        print(f"   - Tracks with audio features: {features_available}/{len(all_tracks)}")
-        print(f"   - Coverage: {(features_available/len(all_tracks)*100):.1f}%")
+        print(f"   - Tracks with audio features: {features_available}/{total_tracks}")
+        print(f"   - Coverage: {(features_available/total_tracks*100):.1f}%")
         
         # Show a sample track
-        sample_track = all_tracks[0]
+        sample_track = db.query(Track).first()
         print(f"\n📊 Sample Track: {sample_track.name}")
         print(f"   - Artist: {sample_track.artist}")
         print(f"   - Spotify ID: {sample_track.spotify_track_id}")
@@ -60,7 +67,7 @@ def check_existing_data():
     
     db.close()
     
-    return len(all_tracks) > 0, features_available if all_tracks else 0
+    return total_tracks > 0, features_available
 
 def create_fallback_strategy():
     """Create strategy for working without Spotify API access."""
@@ -6,6 +6,8 @@ import asyncio
 import sys
 from pathlib import Path
 
+from sqlalchemy import func, or_, select
+
 # Add project root to path
 project_root = Path(__file__).parent
 sys.path.insert(0, str(project_root))
@@ -23,8 +25,10 @@ async def update_missing_audio_features():
     db = SessionLocal()
     
     try:
-        # Get all tracks
-        tracks = db.query(Track).all()
+        # Get all tracks as lightweight rows; only incomplete tracks are
+        # loaded as ORM objects below, since those are the ones updated.
+        feature_columns = [getattr(Track, f) for f in AudioFeaturesService.AUDIO_FEATURES]
+        tracks = db.execute(select(Track.id, Track.name, *feature_columns)).all()
         print(f"Found {len(tracks)} tracks in database")
         
         if not tracks:
@@ -37,30 +41,36 @@ async def update_missing_audio_features():
         
         print(f"Current data completeness: {quality_report.get('overall_completeness', 0):.1%}")
         
-        # Count tracks with missing features
-        tracks_with_missing = []
-        for track in tracks:
-            missing_count = sum(1 for feature in service.AUDIO_FEATURES 
-                              if getattr(track, feature) is None)
-            if missing_count > 0:
-                tracks_with_missing.append(track)
+        # Tracks with missing features, selected by SQLite in one pass
+        tracks_with_missing = (
+            db.query(Track)
+            .filter(or_(*[column.is_(None) for column in feature_columns]))
+            .all()
+        )
         
         print(f"Tracks with missing features: {len(tracks_with_missing)}")
         
         if tracks_with_missing:
-            print("\nFetching missing audio features from Spotify...")
+            print("\nFetching missing audio features from ReccoBeats...")
             
-            # Use the audio features service to fetch missing data
-            updated_tracks = await service.fetch_missing_audio_features(tracks_with_missing, db)
+            # Fetch what ReccoBeats has and impute the rest; the service leaves
+            # the commit to the caller
+            await service.fetch_and_impute_features(tracks_with_missing, db)
+            db.commit()
             
-            # Check results
+            # Check results with one aggregate over the committed table:
+            # COUNT(column) counts the non-null values of each feature
             print("\nChecking results...")
-            final_quality = service.analyze_data_quality(tracks)
-            print(f"Final data completeness: {final_quality.get('overall_completeness', 0):.1%}")
+            track_count, *present_counts = db.execute(
+                select(func.count(), *[func.count(column) for column in feature_columns])
+            ).one()
+            total_values = track_count * len(feature_columns)
+            print(f"Final data completeness: {sum(present_counts) / total_values:.1%}")
             
             # Show some examples
             print("\nExample tracks with updated features:")
-            for track in tracks[:3]:
+            updated_by_id = {track.id: track for track in tracks_with_missing}
+            for track in [updated_by_id.get(row.id, row) for row in tracks[:3]]:
                 features_str = []
                 for feature in ['danceability', 'energy', 'valence', 'tempo']:
                     value = getattr(track, feature)